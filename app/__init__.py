@@ -12,4 +12,4 @@ logger = get_logger("open-agent")
 from app.tool.tool_collection import registry
 
 # Log that tools are registered
-logger.info(f"Registered {len(registry.tools)} tools in the tool registry")
+logger.info(f"Registered {len(registry.names)} tools in the tool registry")
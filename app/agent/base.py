@@ -1,11 +1,51 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+import asyncio
+import threading
+from typing import Any, Coroutine, Dict, List, Optional, TypeVar
 
 from app.schema import Conversation, TaskInput, TaskOutput
 from app.logger import get_logger
 from app.exceptions import AgentError
 from app.tool.base import ToolRegistry
 
+T = TypeVar("T")
+
+# Loop that coroutines started from synchronous code run on, created on first use
+_sync_loop: Optional[asyncio.AbstractEventLoop] = None
+_sync_loop_lock = threading.Lock()
+
+
+def run_coroutine_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine to completion from synchronous code.
+    
+    The coroutine runs on a long-lived loop in a daemon thread, so this works
+    whether or not the caller already has a loop running, and async LLM
+    clients keep their connection pool on one loop across calls.
+    
+    Args:
+        coro (Coroutine): Coroutine to run
+        
+    Returns:
+        T: Result of the coroutine
+    """
+    global _sync_loop
+    with _sync_loop_lock:
+        if _sync_loop is None:
+            _sync_loop = asyncio.new_event_loop()
+            threading.Thread(target=_sync_loop.run_forever, name="agent-sync-loop", daemon=True).start()
+    
+    try:
+        running_loop = asyncio.get_running_loop()
+    except RuntimeError:
+        running_loop = None
+    if running_loop is _sync_loop:
+        # Blocking the loop on its own future would deadlock
+        coro.close()
+        raise AgentError("Synchronous agent run from inside its own event loop; await arun() instead")
+    
+    return asyncio.run_coroutine_threadsafe(coro, _sync_loop).result()
+
 
 class BaseAgent(ABC):
     """Base class for all agents in the system."""
@@ -45,6 +85,20 @@ class BaseAgent(ABC):
         """
         pass
     
+    async def _arun(self, task_input: TaskInput) -> TaskOutput:
+        """
+        Execute the agent asynchronously.
+        Override this in subclasses with native async support; by default the
+        synchronous _run is offloaded to a worker thread.
+        
+        Args:
+            task_input (TaskInput): Task input
+            
+        Returns:
+            TaskOutput: Task output
+        """
+        return await asyncio.to_thread(self._run, task_input)
+    
     def run(self, task_input: TaskInput) -> TaskOutput:
         """
         Run the agent with error handling.
@@ -57,17 +111,7 @@ class BaseAgent(ABC):
         """
         try:
             self.logger.info(f"Running agent '{self.name}' with task: {task_input.task_description}")
-            
-            # Add specific tools if specified in the task input
-            if task_input.tools:
-                for tool_name in task_input.tools:
-                    if tool_name not in self.tools:
-                        tool = self.tool_registry.get(tool_name)
-                        if tool:
-                            self.tools[tool_name] = tool
-                            self.logger.debug(f"Added tool '{tool_name}' to agent '{self.name}'")
-                        else:
-                            self.logger.warning(f"Tool '{tool_name}' not found in registry")
+            self._add_task_tools(task_input)
             
             # Execute the agent
             result = self._run(task_input)
@@ -76,15 +120,71 @@ class BaseAgent(ABC):
             return result
             
         except Exception as e:
-            error_msg = f"Error running agent '{self.name}': {str(e)}"
-            self.logger.error(error_msg)
+            return self._error_output(task_input, e)
+    
+    async def arun(self, task_input: TaskInput) -> TaskOutput:
+        """
+        Run the agent asynchronously with error handling.
+        
+        Args:
+            task_input (TaskInput): Task input
             
-            # Create error output
-            return TaskOutput(
-                success=False,
-                error=error_msg,
-                conversation=task_input.conversation
-            )
+        Returns:
+            TaskOutput: Task output
+        """
+        try:
+            self.logger.info(f"Running agent '{self.name}' with task: {task_input.task_description}")
+            self._add_task_tools(task_input)
+            
+            # Execute the agent
+            result = await self._arun(task_input)
+            
+            self.logger.info(f"Agent '{self.name}' completed task successfully")
+            return result
+            
+        except Exception as e:
+            return self._error_output(task_input, e)
+    
+    def _add_task_tools(self, task_input: TaskInput) -> None:
+        """
+        Add specific tools if specified in the task input.
+        
+        Args:
+            task_input (TaskInput): Task input
+        """
+        if not task_input.tools:
+            return
+        
+        for tool_name in task_input.tools:
+            if tool_name not in self.tools:
+                tool = self.tool_registry.get(tool_name)
+                if tool:
+                    self.tools[tool_name] = tool
+                    self._on_tools_changed()
+                    self.logger.debug(f"Added tool '{tool_name}' to agent '{self.name}'")
+                else:
+                    self.logger.warning(f"Tool '{tool_name}' not found in registry")
+    
+    def _error_output(self, task_input: TaskInput, error: Exception) -> TaskOutput:
+        """
+        Log an agent failure and build the error output.
+        
+        Args:
+            task_input (TaskInput): Task input
+            error (Exception): Error raised while running the agent
+            
+        Returns:
+            TaskOutput: Error output
+        """
+        error_msg = f"Error running agent '{self.name}': {str(error)}"
+        self.logger.error(error_msg)
+        
+        # Create error output
+        return TaskOutput(
+            success=False,
+            error=error_msg,
+            conversation=task_input.conversation
+        )
     
     def get_tool(self, name: str) -> Any:
         """
@@ -104,6 +204,7 @@ class BaseAgent(ABC):
             tool = self.tool_registry.get(name)
             if tool:
                 self.tools[name] = tool
+                self._on_tools_changed()
             else:
                 raise AgentError(f"Tool '{name}' not found")
         return tool
@@ -121,9 +222,17 @@ class BaseAgent(ABC):
         tool = self.tool_registry.get(tool_name)
         if tool:
             self.tools[tool_name] = tool
+            self._on_tools_changed()
             return True
         return False
     
+    def _on_tools_changed(self) -> None:
+        """
+        Hook called whenever the agent's tool set changes.
+        Override this in subclasses to invalidate state derived from the tools.
+        """
+        pass
+    
     def list_tools(self) -> List[Dict[str, Any]]:
         """
         List all tools available to the agent.
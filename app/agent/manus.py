@@ -1,25 +1,103 @@
-from typing import Any, Dict, List, Optional
+from __future__ import annotations
+
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import asyncio
+import hashlib
 import os
 import sys
-import subprocess
 import re
+import uuid
 
-from langchain.agents import AgentExecutor, create_openai_functions_agent
-from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
-from langchain.tools import StructuredTool
-from langchain_core.messages import AIMessage, HumanMessage
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
 
-from app.agent.base import BaseAgent
-from app.schema import AgentType, Conversation, TaskInput, TaskOutput, Message, WebResearchInput
-from app.llm import llm_manager, get_llm_from_config
+from app.agent.base import BaseAgent, run_coroutine_sync
+from app.schema import AgentType, Conversation, TaskInput, TaskOutput, Message, TaskPlan, WebResearchInput
+from app.llm import llm_manager, get_llm_from_config, bind_cache_key, build_system_message, UsageCollector
+from app.config import config
 from app.logger import get_logger
 from app.exceptions import AgentError
-from app.prompt.manus import SYSTEM_PROMPT
-from app.tool.pdf_generator import PDFGeneratorParams
-from app.tool.markdown_generator import MarkdownGeneratorParams
-from app.tool.code_generator import CodeGeneratorParams
-from app.agent.planning import PlanningAgent
+from app.prompt.manus import SYSTEM_PROMPT_STATIC, SYSTEM_PROMPT_TOOLS, TASK_CLASSIFICATION_PROMPT, PLAN_EXECUTION_PREAMBLE
+from app.tool.async_caller import AsyncCaller
+
+if TYPE_CHECKING:
+    from langchain.agents import AgentExecutor
+
+
+@lru_cache(maxsize=None)
+def _tool_args_schemas() -> Dict[str, Any]:
+    """Args schemas for tools that take structured input, imported on first use."""
+    from app.tool.pdf_generator import PDFGeneratorParams
+    from app.tool.markdown_generator import MarkdownGeneratorParams
+    from app.tool.code_generator import CodeGeneratorParams
+    
+    return {
+        "pdf_generator": PDFGeneratorParams,
+        "markdown_generator": MarkdownGeneratorParams,
+        "code_generator": CodeGeneratorParams,
+        "firecrawl_research": WebResearchInput,
+    }
+
+
+# Phrases that introduce a generated file path in agent output, fused into one
+# alternation so the output is scanned once. Code phrases don't accept PDFs.
+_FILE_PATTERN = re.compile(
+    r'(?:generated (?:file|document|code file)|created (?:file|document|code)|saved (?:to|as)'
+    r'|file (?:is at|available at)|output (?:file|saved to))'
+    r'.*?:\s*(?P<path>[^\s]+\.(?:py|js|html|css|pdf|md|txt|json|sh|ts|jsx|tsx))'
+    r'|code (?:file saved as|artifact saved)'
+    r'.*?:\s*(?P<code_path>[^\s]+\.(?:py|js|html|css|md|txt|json|sh|ts|jsx|tsx))',
+    re.IGNORECASE
+)
+
+# Greetings and plain questions that never need a plan
+_NON_TASK_RE = re.compile(r'^\s*(hi|hello|hey|thanks|thank you|what is|who is|why|how does)\b', re.IGNORECASE)
+
+# Verbs that signal the user wants something done
+_IMPERATIVE_RE = re.compile(
+    r'\b(generate|create|build|write|search|research|make|produce|open|run)\b',
+    re.IGNORECASE
+)
+
+# Inputs shorter than this many words are treated as conversation unless they contain an imperative
+_MIN_TASK_WORDS = 6
+
+# Recent plan classifications keyed by a digest of the normalized input
+_PLAN_CACHE: "OrderedDict[str, Tuple[bool, Optional[Tuple[str, ...]]]]" = OrderedDict()
+_PLAN_CACHE_SIZE = 256
+
+# Words that signal a request to open a previously generated artifact
+_OPEN_RE = re.compile(r'\b(open|show|display|view|run|execute)\b', re.IGNORECASE)
+
+# LangChain message classes for the conversation roles the agent replays
+_ROLE_MAP = {"user": HumanMessage, "assistant": AIMessage}
+
+# Extensions grouped under the "code" artifact type
+_CODE_EXTS = frozenset({"py", "js", "ts", "jsx", "tsx", "html", "css", "sh"})
+
+# Tool calls from every agent run here, so worker threads are reused across agents and
+# runs; threads start on first use and exit with the interpreter
+_TOOL_POOL = ThreadPoolExecutor(
+    max_workers=config.get_nested_value(["agent", "max_tool_concurrency"], 4),
+    thread_name_prefix="manus-tool",
+)
+
+
+def _file_extension(path: str) -> str:
+    """Lowercase extension of a path without the dot, or an empty string if it has none."""
+    _, dot, ext = path.rpartition(".")
+    # A dot inside a directory name is not an extension
+    if not dot or "/" in ext or "\\" in ext:
+        return ""
+    return ext.lower()
+
+
+def _plan_cache_key(input_text: str) -> str:
+    """Digest of the input with whitespace normalized, used as the plan cache key."""
+    normalized = " ".join(input_text.split())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
 
 
 class ManusAgent(BaseAgent):
@@ -28,15 +106,26 @@ class ManusAgent(BaseAgent):
     Uses LangChain's OpenAI Functions Agent for task execution.
     """
     
-    def __init__(self, tools: Optional[List[str]] = None):
+    def __init__(self, tools: Optional[List[str]] = None, session_id: Optional[str] = None):
         """
         Initialize the Manus agent.
         
         Args:
             tools (List[str], optional): List of tool names to use
+            session_id (str, optional): Sent as the prompt cache key so turns of a session share a cache
         """
         super().__init__(name=AgentType.MANUS.value, tools=tools)
         self.llm = llm_manager.llm
+        self.session_id = session_id
+        self._agent_executor: Optional[AgentExecutor] = None
+        # Called with each generated token when set, so callers can stream output
+        self.on_token: Optional[Callable[[str], None]] = None
+        # Bounds parallel tool calls and retries rate-limited ones
+        self._async_caller = AsyncCaller(
+            max_concurrency=config.get_nested_value(["agent", "max_tool_concurrency"], 4),
+            max_retries=config.get_nested_value(["agent", "max_tool_retries"], 6),
+            executor=_TOOL_POOL,
+        )
         
         # Define default tools if none provided
         if not tools:
@@ -49,8 +138,26 @@ class ManusAgent(BaseAgent):
             ]
             for tool_name in default_tools:
                 self.add_tool(tool_name)
+        
+        # The tool set and prompt are fixed from here on, so build the executor once
+        self._agent_executor = self._create_agent_executor()
+    
+    def _on_tools_changed(self) -> None:
+        """Drop the cached executor so it is rebuilt with the new tool set."""
+        self._agent_executor = None
     
-    def _infer_task_and_plan(self, input_text: str) -> tuple[bool, Optional[List[str]]]:
+    def _get_agent_executor(self) -> AgentExecutor:
+        """
+        Get the cached agent executor, building it if needed.
+        
+        Returns:
+            AgentExecutor: LangChain agent executor
+        """
+        if self._agent_executor is None:
+            self._agent_executor = self._create_agent_executor()
+        return self._agent_executor
+    
+    async def _infer_task_and_plan(self, input_text: str) -> tuple[bool, Optional[List[str]]]:
         """
         Determine if the user input is a task and generate a plan if needed.
         
@@ -60,37 +167,37 @@ class ManusAgent(BaseAgent):
         Returns:
             tuple[bool, Optional[List[str]]]: (is_task, plan)
         """
-        # Ask the LLM to determine if this is a task requiring a plan
-        prompt = f"""
-        Analyze the following user input and determine if it's a task that requires multiple steps to complete:
+        # Skip the classification round trip for obvious conversation
+        if not _IMPERATIVE_RE.search(input_text) and (
+            len(input_text.split()) < _MIN_TASK_WORDS or _NON_TASK_RE.match(input_text)
+        ):
+            return False, None
         
-        USER INPUT: {input_text}
+        # Reuse the classification of an identical earlier input
+        cache_key = _plan_cache_key(input_text)
+        cached = _PLAN_CACHE.get(cache_key)
+        if cached is not None:
+            _PLAN_CACHE.move_to_end(cache_key)
+            is_task, plan = cached
+            return is_task, list(plan) if plan is not None else None
         
-        First, determine if this is a task (requiring actions) or just a question/conversation:
-        - If it's just a question or conversation, respond with "NOT_A_TASK"
-        - If it's a task requiring actions, respond with "TASK" followed by a numbered list of clear, specific steps to complete it
+        # Ask the LLM to determine if this is a task requiring a plan
+        prompt = TASK_CLASSIFICATION_PROMPT.format(input_text=input_text)
         
-        Example response for a task:
-        TASK
-        1. Search for information about Python memory management
-        2. Generate a summary of key points
-        3. Create a PDF document with the findings
+        task_plan = await llm_manager.agenerate_structured(prompt, TaskPlan)
         
-        Example response for a non-task:
-        NOT_A_TASK
-        """
+        # Don't remember failed LLM calls
+        if task_plan is None:
+            return False, None
         
-        response = llm_manager.generate_text(prompt)
+        is_task = task_plan.is_task and bool(task_plan.steps)
+        plan = [step.strip() for step in task_plan.steps if step.strip()] if is_task else None
         
-        # Process the response
-        if response.strip().startswith("TASK"):
-            # Extract the plan from the response
-            plan_lines = response.strip().split("\n")[1:]
-            # Clean up the plan steps
-            plan = [line.strip() for line in plan_lines if line.strip()]
-            return True, plan
-        else:
-            return False, None
+        _PLAN_CACHE[cache_key] = (is_task, tuple(plan) if plan is not None else None)
+        if len(_PLAN_CACHE) > _PLAN_CACHE_SIZE:
+            _PLAN_CACHE.popitem(last=False)
+        
+        return is_task, plan
     
     def _create_agent_executor(self) -> AgentExecutor:
         """
@@ -99,39 +206,36 @@ class ManusAgent(BaseAgent):
         Returns:
             AgentExecutor: LangChain agent executor
         """
+        # Imported here to keep the agent machinery off the startup path
+        from langchain.agents import AgentExecutor, create_openai_functions_agent
+        from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+        from langchain.tools import StructuredTool
+        
         # Convert tools to LangChain-compatible tools
+        args_schemas = _tool_args_schemas()
         langchain_tools = []
         for tool_name, tool in self.tools.items():
-            # Get the appropriate args schema for the tool
-            args_schema = None
-            if tool_name == "pdf_generator":
-                args_schema = PDFGeneratorParams
-            elif tool_name == "markdown_generator":
-                args_schema = MarkdownGeneratorParams
-            elif tool_name == "code_generator":
-                args_schema = CodeGeneratorParams
-            elif tool_name == "firecrawl_research":
-                args_schema = WebResearchInput
-            
             # Create a structured tool that properly handles multiple arguments
             structured_tool = StructuredTool.from_function(
                 name=tool.name,
                 description=tool.description,
                 func=tool.safe_run,
-                args_schema=args_schema
+                coroutine=self._async_caller.wrap(tool.safe_run),
+                args_schema=args_schemas.get(tool_name)
             )
             langchain_tools.append(structured_tool)
         
-        # Create prompt
+        # Create prompt. The static system prompt leads so providers can reuse
+        # its cached prefix; per-request content stays at the end.
         prompt = ChatPromptTemplate.from_messages([
-            ("system", SYSTEM_PROMPT),
+            self._system_message(),
             MessagesPlaceholder(variable_name="conversation"),
             ("human", "{input}"),
             MessagesPlaceholder(variable_name="agent_scratchpad"),
         ])
         
         # Create agent
-        agent = create_openai_functions_agent(self.llm, langchain_tools, prompt)
+        agent = create_openai_functions_agent(bind_cache_key(self.llm, self.session_id), langchain_tools, prompt)
         
         # Create agent executor
         agent_executor = AgentExecutor(
@@ -144,7 +248,83 @@ class ManusAgent(BaseAgent):
         
         return agent_executor
     
+    def _system_message(self) -> SystemMessage:
+        """
+        Build the system message every executor request starts with.
+        
+        Returns:
+            SystemMessage: System message
+        """
+        return build_system_message(SYSTEM_PROMPT_STATIC, self.llm, dynamic_text=SYSTEM_PROMPT_TOOLS)
+    
+    async def warm_cache(self) -> None:
+        """
+        Send a one-token request with the executor's system prompt and functions
+        so the provider has the shared prefix cached before the first real turn.
+        Failures are logged and ignored; warming is only an optimization.
+        """
+        from langchain_core.utils.function_calling import convert_to_openai_function
+        
+        try:
+            # Match the executor's request prefix: functions, then the system prompt
+            functions = [convert_to_openai_function(tool) for tool in self._get_agent_executor().tools]
+            llm = bind_cache_key(self.llm, self.session_id).bind(functions=functions, max_tokens=1)
+            await llm.ainvoke([self._system_message(), HumanMessage(content=".")])
+            self.logger.debug("Prompt cache warmed")
+        except Exception as e:
+            self.logger.debug(f"Prompt cache warm-up failed: {e}")
+    
+    async def _invoke_executor(
+        self,
+        agent_executor: AgentExecutor,
+        inputs: Dict[str, Any],
+        usage: Optional[UsageCollector] = None
+    ) -> Dict[str, Any]:
+        """
+        Invoke the agent executor, streaming tokens to on_token when it is set.
+        
+        Args:
+            agent_executor (AgentExecutor): LangChain agent executor
+            inputs (Dict[str, Any]): Executor inputs
+            usage (UsageCollector, optional): Collects token usage across the run
+            
+        Returns:
+            Dict[str, Any]: Executor result
+        """
+        run_config = {"callbacks": [usage]} if usage is not None else None
+        if self.on_token is None:
+            return await agent_executor.ainvoke(inputs, config=run_config)
+        
+        try:
+            result = None
+            async for event in agent_executor.astream_events(inputs, config=run_config, version="v2"):
+                kind = event["event"]
+                if kind == "on_chat_model_stream":
+                    content = event["data"]["chunk"].content
+                    if content:
+                        self.on_token(content)
+                elif kind == "on_chain_end" and not event.get("parent_ids"):
+                    # The root run's end event carries the final executor output
+                    result = event["data"].get("output")
+            return result or {}
+        except NotImplementedError:
+            # Provider can't stream; fall back to a single response
+            self.logger.debug("Streaming not supported, falling back to ainvoke")
+            return await agent_executor.ainvoke(inputs, config=run_config)
+    
     def _run(self, task_input: TaskInput) -> TaskOutput:
+        """
+        Run the Manus agent from synchronous code.
+        
+        Args:
+            task_input (TaskInput): Task input
+            
+        Returns:
+            TaskOutput: Task output
+        """
+        return run_coroutine_sync(self._arun(task_input))
+    
+    async def _arun(self, task_input: TaskInput) -> TaskOutput:
         """
         Run the Manus agent.
         
@@ -162,34 +342,35 @@ class ManusAgent(BaseAgent):
         conversation = parameters.get("conversation", None)
         
         # Convert conversation to the format expected by the agent
-        formatted_conversation = []
-        if conversation and isinstance(conversation, Conversation):
-            for message in conversation.messages:
-                if message.role == "user":
-                    formatted_conversation.append(HumanMessage(content=message.content))
-                elif message.role == "assistant":
-                    formatted_conversation.append(AIMessage(content=message.content))
         # If no conversation is provided, we'll use an empty list
-        else:
-            formatted_conversation = []
+        formatted_conversation = []
+        if isinstance(conversation, Conversation) and conversation.messages:
+            formatted_conversation = [
+                _ROLE_MAP[message.role](content=message.content)
+                for message in conversation.messages
+                if message.role in _ROLE_MAP
+            ]
         
         # Check if we need a plan
-        is_task, plan = self._infer_task_and_plan(task_description)
+        is_task, plan = await self._infer_task_and_plan(task_description)
+        
+        usage = UsageCollector()
         
         if not is_task:
             # If this doesn't appear to be a task, handle as a regular query
-            agent_executor = self._create_agent_executor()
+            agent_executor = self._get_agent_executor()
             try:
-                result = agent_executor.invoke({
+                result = await self._invoke_executor(agent_executor, {
                     "input": task_description,
                     "conversation": formatted_conversation
-                })
+                }, usage)
+                self._log_usage(usage)
                 
                 return TaskOutput(
                     content=result.get("output", ""),
                     success=True,
                     result=result.get("output", ""),
-                    metadata={"agent_type": self.name}
+                    metadata={"agent_type": self.name, **usage.to_dict()}
                 )
             except Exception as e:
                 self.logger.error(f"Error in agent execution: {str(e)}")
@@ -201,53 +382,33 @@ class ManusAgent(BaseAgent):
                 )
         
         # Run the agent with the task and plan
-        agent_executor = self._create_agent_executor()
+        agent_executor = self._get_agent_executor()
         
         # Format the input with the plan if available
         prompt_with_plan = task_description
         if plan:
-            prompt_with_plan = f"""
-Task: {task_description}
-
-I've created a plan to help accomplish this task:
-{self._format_plan_for_agent(plan)}
-
-Please execute this plan step by step, using the available tools when needed.
-For document generation, ensure high-quality, well-formatted Markdown content.
-For code generation, write clean, well-documented code following best practices.
-"""
+            prompt_with_plan = (
+                f"{PLAN_EXECUTION_PREAMBLE}\n\n"
+                f"Plan:\n{self._format_plan_for_agent(plan)}\n\n"
+                f"Task: {task_description}"
+            )
         
         # Execute the agent
         try:
             self.logger.info(f"Executing task with {len(self.tools)} tools")
-            result = agent_executor.invoke({
+            result = await self._invoke_executor(agent_executor, {
                 "input": prompt_with_plan,
                 "conversation": formatted_conversation
-            })
+            }, usage)
+            self._log_usage(usage)
             
             # Process the output
             raw_output = result.get("output", "")
             
-            # Extract artifacts from the output
+            # Extract artifacts from the output, falling back to tool results
             artifacts = self._extract_artifacts_from_output(raw_output)
-            
-            # Also check for artifacts in intermediate_steps tool results
             if not artifacts and "intermediate_steps" in result:
-                for action, action_result in result["intermediate_steps"]:
-                    if isinstance(action_result, dict) and "artifact_path" in action_result:
-                        # Found an artifact in a tool result
-                        artifact_path = action_result["artifact_path"]
-                        ext = os.path.splitext(artifact_path)[1][1:]  # Get extension without the dot
-                        
-                        # Determine artifact type based on extension
-                        artifact_type = "code" if ext in ["py", "js", "ts", "jsx", "tsx", "html", "css", "sh"] else ext
-                        
-                        # Create or update artifacts dict
-                        if not artifacts:
-                            artifacts = {}
-                        if artifact_type not in artifacts:
-                            artifacts[artifact_type] = []
-                        artifacts[artifact_type].append(artifact_path)
+                artifacts = self._group_artifacts(self._artifact_paths_from_steps(result["intermediate_steps"]))
             
             return TaskOutput(
                 success=True,
@@ -256,7 +417,8 @@ For code generation, write clean, well-documented code following best practices.
                     "agent_type": self.name,
                     "plan": plan,
                     "artifacts": artifacts,
-                    "tool_calls": self._count_tool_calls(result)
+                    "tool_calls": self._count_tool_calls(result),
+                    **usage.to_dict()
                 }
             )
         except Exception as e:
@@ -268,9 +430,16 @@ For code generation, write clean, well-documented code following best practices.
                 metadata={"agent_type": self.name, "error": str(e), "plan": plan}
             )
             
+    def _log_usage(self, usage: UsageCollector) -> None:
+        """Log prompt cache effectiveness so prompt-template regressions are visible."""
+        self.logger.info(
+            f"LLM usage: {usage.llm_calls} calls, {usage.prompt_tokens} prompt tokens, "
+            f"{usage.cached_tokens} cached ({usage.cache_hit_rate:.0%} cache hit rate)"
+        )
+    
     def _format_plan_for_agent(self, plan: List[str]) -> str:
         """Format the plan for inclusion in the agent prompt."""
-        return "\n".join([f"- {step}" for step in plan])
+        return "\n".join(f"{number}. {step}" for number, step in enumerate(plan, 1))
         
     def _extract_artifacts_from_output(self, output: str) -> Optional[Dict[str, Any]]:
         """
@@ -282,61 +451,57 @@ For code generation, write clean, well-documented code following best practices.
         Returns:
             Optional[Dict[str, Any]]: Extracted artifacts or None
         """
-        # Look for file paths in the output
-        file_patterns = [
-            r'generated (?:file|document|code file).*?:\s*([^\s]+\.(?:py|js|html|css|pdf|md|txt|json|sh|ts|jsx|tsx))',
-            r'created (?:file|document|code).*?:\s*([^\s]+\.(?:py|js|html|css|pdf|md|txt|json|sh|ts|jsx|tsx))',
-            r'saved (?:to|as).*?:\s*([^\s]+\.(?:py|js|html|css|pdf|md|txt|json|sh|ts|jsx|tsx))',
-            r'file (?:is at|available at).*?:\s*([^\s]+\.(?:py|js|html|css|pdf|md|txt|json|sh|ts|jsx|tsx))',
-            r'output (?:file|saved to).*?:\s*([^\s]+\.(?:py|js|html|css|pdf|md|txt|json|sh|ts|jsx|tsx))',
-            r'code (?:file saved as|artifact saved).*?:\s*([^\s]+\.(?:py|js|html|css|md|txt|json|sh|ts|jsx|tsx))'
-        ]
-        
-        artifacts = {}
-        
-        for pattern in file_patterns:
-            matches = re.findall(pattern, output, re.IGNORECASE)
-            if matches:
-                for match in matches:
-                    file_path = match.strip()
-                    # Extract file extension
-                    _, ext = os.path.splitext(file_path)
-                    artifact_type = ext[1:] if ext else "file"
-                    
-                    # Check if this is code
-                    if artifact_type in ['py', 'js', 'ts', 'jsx', 'tsx', 'html', 'css', 'sh']:
-                        if 'code' not in artifacts:
-                            artifacts['code'] = []
-                        artifacts['code'].append(file_path)
-                    else:
-                        if artifact_type not in artifacts:
-                            artifacts[artifact_type] = []
-                        artifacts[artifact_type].append(file_path)
-        
-        # Additional check: see if there are artifacts in tool results from intermediate steps
-        if not artifacts and hasattr(self, 'agent_executor') and hasattr(self.agent_executor, 'intermediate_steps'):
-            for step in self.agent_executor.intermediate_steps:
-                if isinstance(step, tuple) and len(step) == 2:
-                    result = step[1]
-                    if isinstance(result, dict) and 'artifact_path' in result:
-                        artifact_path = result['artifact_path']
-                        _, ext = os.path.splitext(artifact_path)
-                        artifact_type = ext[1:] if ext else "file"
-                        
-                        # Classify code artifacts
-                        if artifact_type in ['py', 'js', 'ts', 'jsx', 'tsx', 'html', 'css', 'sh']:
-                            if 'code' not in artifacts:
-                                artifacts['code'] = []
-                            artifacts['code'].append(artifact_path)
-                        else:
-                            if artifact_type not in artifacts:
-                                artifacts[artifact_type] = []
-                            artifacts[artifact_type].append(artifact_path)
-                    
-        if not artifacts:
-            return None
+        return self._group_artifacts(
+            (match.group("path") or match.group("code_path")).strip() for match in _FILE_PATTERN.finditer(output)
+        )
+    
+    def _group_artifacts(self, paths: Iterable[str]) -> Optional[Dict[str, List[str]]]:
+        """
+        Group artifact paths by type, keeping the first occurrence of each path.
+        
+        Args:
+            paths (Iterable[str]): Artifact file paths
             
-        return artifacts
+        Returns:
+            Optional[Dict[str, List[str]]]: Paths keyed by artifact type, or None if there are none
+        """
+        artifacts = defaultdict(list)
+        # Several phrasings can announce the same file, so record each path once
+        seen = set()
+        for path in paths:
+            if path in seen:
+                continue
+            seen.add(path)
+            self._add_artifact(artifacts, path)
+        return dict(artifacts) or None
+    
+    def _add_artifact(self, artifacts: Dict[str, List[str]], path: str) -> None:
+        """
+        Classify an artifact path by extension and add it to the matching group.
+        
+        Args:
+            artifacts (Dict[str, List[str]]): Artifact groups, usually a defaultdict(list)
+            path (str): Artifact file path
+        """
+        ext = _file_extension(path)
+        artifacts["code" if ext in _CODE_EXTS else (ext or "file")].append(path)
+    
+    @staticmethod
+    def _artifact_paths_from_steps(intermediate_steps: List[Tuple[Any, Any]]) -> Iterator[str]:
+        """
+        Yield artifact paths reported by tool results.
+        
+        Args:
+            intermediate_steps (List[Tuple[Any, Any]]): Executor (action, result) pairs
+            
+        Yields:
+            str: Artifact file path
+        """
+        for step in intermediate_steps:
+            if isinstance(step, tuple) and len(step) == 2:
+                action_result = step[1]
+                if isinstance(action_result, dict) and "artifact_path" in action_result:
+                    yield action_result["artifact_path"]
         
     def _count_tool_calls(self, result: Dict[str, Any]) -> int:
         """Count the number of tool calls made during execution."""
@@ -351,13 +516,27 @@ class Manus:
     Main interface class for the OpenAgent system.
     """
     
-    def __init__(self):
-        """Initialize the Manus interface."""
-        self.agent = ManusAgent()
+    def __init__(self, session_id: Optional[str] = None):
+        """
+        Initialize the Manus interface.
+        
+        Args:
+            session_id (str, optional): Identifies this session to the provider; generated if not given
+        """
+        self.session_id = session_id or uuid.uuid4().hex
+        self.agent = ManusAgent(session_id=self.session_id)
         self.logger = get_logger("manus")
-        self.recent_artifacts = []
+        # Only the 5 most recent artifact sets are kept; older ones drop off on append
+        self.recent_artifacts = deque(maxlen=5)
         self.conversation = Conversation(messages=[])
+        # Whether any tokens were streamed to the console for the current prompt
+        self._streamed = False
+        self.agent.on_token = self._print_token
         
+    async def warm_cache(self):
+        """Prime the provider's prompt cache with the agent's system prompt."""
+        await self.agent.warm_cache()
+    
     async def run(self, prompt: str):
         """
         Process a user prompt asynchronously.
@@ -379,9 +558,9 @@ class Manus:
         )
         
         try:
-            # Run the agent (asynchronously)
-            loop = asyncio.get_event_loop()
-            result = await loop.run_in_executor(None, lambda: self.agent.run(task_input))
+            # Run the agent on the event loop so LLM and tool I/O can overlap
+            self._streamed = False
+            result = await self.agent.arun(task_input)
             
             # Process the result
             if result.success:
@@ -392,8 +571,11 @@ class Manus:
                 if result.metadata and "artifacts" in result.metadata:
                     await self._process_artifacts(result.metadata["artifacts"])
                 
-                # Display the output to the user
-                print(f"\n{output}\n")
+                # Display the output to the user unless it was already streamed
+                if self._streamed:
+                    print("\n")
+                else:
+                    print(f"\n{output}\n")
                 
                 # Add assistant message to conversation
                 self.conversation.messages.append(Message(role="assistant", content=output))
@@ -414,6 +596,38 @@ class Manus:
             # Add error message to conversation
             self.conversation.messages.append(Message(role="assistant", content=error_msg))
     
+    async def run_batch(self, prompts: List[str]) -> List[TaskOutput]:
+        """
+        Run independent prompts concurrently so the provider can batch them.
+        Prompts don't see each other or the interactive conversation, and
+        tokens aren't streamed to the console.
+        
+        Args:
+            prompts (List[str]): Prompts to run
+            
+        Returns:
+            List[TaskOutput]: Outputs in the same order as the prompts
+        """
+        on_token, self.agent.on_token = self.agent.on_token, None
+        try:
+            return await asyncio.gather(*(
+                self.agent.arun(TaskInput(task_description=prompt)) for prompt in prompts
+            ))
+        finally:
+            self.agent.on_token = on_token
+    
+    def _print_token(self, token: str):
+        """
+        Print a streamed token as soon as it arrives.
+        
+        Args:
+            token (str): Generated token
+        """
+        if not self._streamed:
+            print()
+            self._streamed = True
+        print(token, end="", flush=True)
+    
     async def _check_artifact_request(self, prompt: str) -> bool:
         """
         Check if the user is requesting to open an artifact.
@@ -428,8 +642,7 @@ class Manus:
             return False
             
         # Check if this might be a request to open a file
-        open_terms = ["open", "show", "display", "view", "run", "execute"]
-        if not any(term in prompt.lower() for term in open_terms):
+        if not _OPEN_RE.search(prompt):
             return False
             
         # Get a list of artifact file paths
@@ -441,9 +654,10 @@ class Manus:
             return False
             
         # Look for file names or extensions in the prompt
+        prompt_lower = prompt.lower()
         for path in artifact_paths:
-            filename = os.path.basename(path)
-            if filename.lower() in prompt.lower() or os.path.splitext(filename)[1][1:].lower() in prompt.lower():
+            filename = os.path.basename(path).lower()
+            if filename in prompt_lower or _file_extension(filename) in prompt_lower:
                 await self._open_artifact(path)
                 
                 # Add response to conversation
@@ -466,8 +680,6 @@ class Manus:
             
         # Store in recent artifacts
         self.recent_artifacts.append(artifacts)
-        if len(self.recent_artifacts) > 5:  # Keep only the 5 most recent sets
-            self.recent_artifacts.pop(0)
             
         # Display artifacts to the user
         print("\nGenerated files:")
@@ -508,6 +720,8 @@ class Manus:
             self.logger.error(f"File does not exist: {file_path}")
             return
             
+        import subprocess
+        
         try:
             # Use appropriate command based on platform
             if sys.platform == "darwin":  # macOS
@@ -7,14 +7,75 @@ ICLR 2023: https://arxiv.org/abs/2210.03629
 The ReAct approach interleaves reasoning traces (Thought) with task-specific actions,
 enabling the agent to perform dynamic reasoning while interacting with external tools.
 """
-from typing import Any, Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+import asyncio
 import re
 import json
 
-from app.agent.base import BaseAgent
+from app.agent.base import BaseAgent, run_coroutine_sync
 from app.schema import AgentType, TaskInput, TaskOutput, Message, Conversation
-from app.llm import llm_manager
-from app.prompt.react import REACT_SYSTEM_PROMPT, REACT_STEP_PROMPT, REACT_OBSERVATION_PROMPT
+from app.prompt.react import (
+    REACT_SYSTEM_PROMPT, REACT_CONTEXT_PROMPT, REACT_STEP_PREFIX,
+    REACT_OBSERVATION_PROMPT, REACT_HISTORY_SUMMARY_PROMPT
+)
+
+# Section headers of a ReAct response, matched at the start of a line
+_RE_SECTION = re.compile(r'\s*(Thought|Action\s*Input|Action|Final\s*Answer)\s*:\s*(.*)', re.IGNORECASE)
+
+# A final answer, which may also start mid-line after other text
+_RE_FINAL_ANSWER = re.compile(r'Final\s*Answer\s*:', re.IGNORECASE)
+
+# Shared decoder for action inputs; raw_decode stops at the end of the first JSON value
+_JSON_DECODER = json.JSONDecoder()
+
+# Text allowed before the JSON value of an action input (an opening markdown fence)
+_JSON_PREFIXES = ("", "```", "```json")
+
+# An action input with content followed by a blank line; nothing after it is parsed.
+# Blank lines before the content don't count, matching _parse_response
+_RE_ACTION_INPUT_DONE = re.compile(r'^\s*Action\s*Input\s*:\s*\S.*?\n[ \t]*\n', re.IGNORECASE | re.MULTILINE | re.DOTALL)
+
+# The model should stop before inventing its own observation
+_REACT_STOP = ["\nObservation:"]
+
+# Steps kept verbatim when older history is compressed into a summary
+_HISTORY_KEEP_RECENT = 2
+
+# Upper bound on worker threads for one batched action
+_MAX_BATCH_WORKERS = 8
+
+# Placed between the observations of a batched action
+_BATCH_SEPARATOR = "\n---\n"
+
+# Consecutive responses without an action or final answer before the loop gives up
+_MAX_PARSE_FAILURES = 3
+
+
+class _TraceEntry:
+    """One step of the execution trace, converted to a dict only when the task output is built."""
+
+    __slots__ = ("thought", "action", "action_input", "observation", "final_answer")
+
+    def __init__(self, thought: str):
+        self.thought = thought
+        self.action = None
+        self.action_input = None
+        self.observation = None
+        self.final_answer = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the entry to a trace dictionary.
+
+        Returns:
+            Dict[str, Any]: Fields that were set during the step
+        """
+        return {
+            name: getattr(self, name)
+            for name in self.__slots__
+            if getattr(self, name) is not None
+        }
 
 
 class ReactAgent(BaseAgent):
@@ -35,7 +96,9 @@ class ReactAgent(BaseAgent):
         self,
         tools: Optional[List[str]] = None,
         max_iterations: int = 10,
-        verbose: bool = True
+        verbose: bool = True,
+        history_window: int = 6,
+        compress_history: bool = True
     ):
         """
         Initialize the ReAct agent.
@@ -44,10 +107,17 @@ class ReactAgent(BaseAgent):
             tools (List[str], optional): List of tool names to use
             max_iterations (int): Maximum number of reasoning cycles (default: 10)
             verbose (bool): Whether to log detailed execution traces
+            history_window (int): Number of most recent steps replayed in the prompt (default: 6)
+            compress_history (bool): Summarize steps that fall out of the window instead of dropping them
         """
         super().__init__(name=AgentType.REACT.value, tools=tools)
         self.max_iterations = max_iterations
         self.verbose = verbose
+        self.history_window = history_window
+        self.compress_history = compress_history
+        self._tools_description_cache: Optional[str] = None
+        self._tools_lower: Optional[Dict[str, str]] = None
+        self._tools_names_repr: Optional[str] = None
 
         # Define default tools if none provided
         if not tools:
@@ -61,6 +131,12 @@ class ReactAgent(BaseAgent):
             for tool_name in default_tools:
                 self.add_tool(tool_name)
 
+    def _on_tools_changed(self) -> None:
+        """Drop the cached tool descriptions and name index so they are rebuilt for the new tool set."""
+        self._tools_description_cache = None
+        self._tools_lower = None
+        self._tools_names_repr = None
+
     def _format_tools_description(self) -> str:
         """
         Format available tools into a description string for the prompt.
@@ -68,6 +144,9 @@ class ReactAgent(BaseAgent):
         Returns:
             str: Formatted tool descriptions
         """
+        if self._tools_description_cache is not None:
+            return self._tools_description_cache
+
         tool_descriptions = []
         for tool_name, tool in self.tools.items():
             # Get parameter info if available
@@ -80,9 +159,61 @@ class ReactAgent(BaseAgent):
 
             tool_descriptions.append(f"- {tool_name}: {tool.description}{params_info}")
 
-        return "\n".join(tool_descriptions)
+        self._tools_description_cache = "\n".join(tool_descriptions)
+        return self._tools_description_cache
 
-    def _parse_action(self, response: str) -> Tuple[Optional[str], Optional[Dict], Optional[str]]:
+    def _parse_response(self, response: str) -> Dict[str, Optional[str]]:
+        """
+        Split an LLM response into its ReAct sections in a single pass.
+
+        Args:
+            response (str): LLM response text
+
+        Returns:
+            Dict[str, Optional[str]]: Text of the first "thought", "action",
+            "action_input" and "final_answer" sections, or None if absent
+        """
+        sections: Dict[str, List[str]] = {}
+        current: Optional[List[str]] = None
+        current_name = None
+
+        for raw_line in response.splitlines():
+            if current_name == "final_answer":
+                # The final answer runs to the end of the response
+                current.append(raw_line)
+                continue
+
+            # Every header has a colon, so most body lines skip the regexes entirely
+            final_answer = _RE_FINAL_ANSWER.search(raw_line) if ":" in raw_line else None
+            if final_answer and raw_line[:final_answer.start()].strip():
+                # e.g. "Thought: done. Final Answer: 42" - split before the answer
+                lines = (raw_line[:final_answer.start()], raw_line[final_answer.start():])
+            else:
+                lines = (raw_line,)
+
+            for line in lines:
+                header = _RE_SECTION.match(line) if ":" in line else None
+                if header:
+                    current_name = "_".join(header.group(1).lower().split())
+                    if current_name in sections:
+                        # Only the first occurrence of each section counts
+                        current = None
+                    else:
+                        current = sections[current_name] = [header.group(2)]
+                    continue
+
+                if current_name == "action_input" and not line.strip() and current and "".join(current).strip():
+                    # A blank line after the action input's content ends it
+                    current = None
+                if current is not None:
+                    current.append(line)
+
+        parsed = {name: None for name in ("thought", "action", "action_input", "final_answer")}
+        for name, lines in sections.items():
+            parsed[name] = "\n".join(lines).strip()
+        return parsed
+
+    def _parse_action(self, response: str) -> Tuple[Optional[str], Optional[Union[Dict, List[Dict]]], Optional[str]]:
         """
         Parse the LLM response to extract action, parameters, or final answer.
 
@@ -91,53 +222,54 @@ class ReactAgent(BaseAgent):
 
         Returns:
             Tuple of (action_name, action_params, final_answer)
-            - If action found: (action_name, params_dict, None)
+            - If action found: (action_name, params_dict, None), or a list of
+              params dicts when the action input is a JSON list (a batched action)
             - If final answer: (None, None, final_answer)
             - If parse error: (None, None, None)
         """
-        # Check for Final Answer
-        final_answer_match = re.search(
-            r'Final\s*Answer\s*:\s*(.+)',
-            response,
-            re.IGNORECASE | re.DOTALL
-        )
-        if final_answer_match:
-            return None, None, final_answer_match.group(1).strip()
-
-        # Check for Action
-        action_match = re.search(
-            r'Action\s*:\s*(\w+)',
-            response,
-            re.IGNORECASE
-        )
+        return self._action_from_sections(self._parse_response(response))
 
-        if not action_match:
-            return None, None, None
+    def _action_from_sections(
+        self,
+        sections: Dict[str, Optional[str]]
+    ) -> Tuple[Optional[str], Optional[Union[Dict, List[Dict]]], Optional[str]]:
+        """
+        Interpret parsed response sections as an action or final answer.
 
-        action_name = action_match.group(1).strip()
+        Args:
+            sections (Dict[str, Optional[str]]): Output of _parse_response
 
-        # Extract Action Input
-        action_input_match = re.search(
-            r'Action\s*Input\s*:\s*(.+?)(?=\n\n|\nThought:|$)',
-            response,
-            re.IGNORECASE | re.DOTALL
-        )
+        Returns:
+            Tuple of (action_name, action_params, final_answer), as for _parse_action
+        """
+        # Check for Final Answer
+        if sections["final_answer"]:
+            return None, None, sections["final_answer"]
+
+        # Check for Action: the name is the identifier at the start of the section,
+        # e.g. "[google_search]", "`bash`." or "search(query='x')"
+        action = sections["action"] or ""
+        start = end = 1 if action[:1] in ("[", "`") else 0
+        while end < len(action) and (action[end].isalnum() or action[end] == "_"):
+            end += 1
+        action_name = action[start:end]
+
+        if not action_name:
+            return None, None, None
 
         action_params = {}
-        if action_input_match:
-            input_text = action_input_match.group(1).strip()
+        if sections["action_input"]:
+            input_text = sections["action_input"]
 
-            # Try to parse as JSON
+            # Try to parse as JSON, ignoring a markdown fence or prose after the value
             try:
-                # Handle both raw JSON and markdown-wrapped JSON
-                if input_text.startswith('```'):
-                    # Extract from markdown code block
-                    json_match = re.search(r'```(?:json)?\s*(.+?)\s*```', input_text, re.DOTALL)
-                    if json_match:
-                        input_text = json_match.group(1)
-
-                action_params = json.loads(input_text)
-            except json.JSONDecodeError:
+                starts = [i for i in (input_text.find('{'), input_text.find('[')) if i != -1]
+                start = min(starts) if starts else -1
+                if start == -1 or input_text[:start].strip().lower() not in _JSON_PREFIXES:
+                    raise ValueError("Action input does not start with JSON")
+
+                action_params, _ = _JSON_DECODER.raw_decode(input_text, start)
+            except ValueError:
                 # Try to parse as key-value pairs
                 if '=' in input_text or ':' in input_text:
                     # Simple key-value parsing
@@ -154,34 +286,138 @@ class ReactAgent(BaseAgent):
 
         return action_name, action_params, None
 
-    def _execute_tool(self, tool_name: str, params: Dict[str, Any]) -> str:
+    def _truncate_params_for_history(
+        self,
+        params: Optional[Union[Dict[str, Any], List[Dict[str, Any]]]],
+        max_len: int = 500
+    ) -> str:
+        """
+        Serialize action parameters for the history, shortening long string values.
+
+        Args:
+            params (Dict[str, Any] or List[Dict[str, Any]], optional): Action parameters,
+                or one set per call for a batched action
+            max_len (int): Maximum length kept for each string value
+
+        Returns:
+            str: JSON-encoded parameters
+        """
+        if not params:
+            return json.dumps(params)
+
+        # Large values (e.g. echoed page content) are already in the observation
+        def shorten(values: Dict[str, Any]) -> Dict[str, Any]:
+            return {
+                key: value[:max_len] + "... [truncated]" if isinstance(value, str) and len(value) > max_len else value
+                for key, value in values.items()
+            }
+
+        if isinstance(params, list):
+            return json.dumps([shorten(p) if isinstance(p, dict) else p for p in params])
+        return json.dumps(shorten(params))
+
+    def _truncate_observation(self, content: Any, max_len: int = 2000) -> str:
+        """
+        Convert tool content to observation text, keeping at most max_len characters.
+
+        Args:
+            content (Any): Tool result content
+            max_len (int): Maximum number of characters kept
+
+        Returns:
+            str: Observation text
+        """
+        # Slice binary payloads before decoding so large pages are never fully copied;
+        # a UTF-8 character is at most 4 bytes, so this still yields max_len characters
+        if isinstance(content, (bytes, bytearray, memoryview)):
+            content = bytes(memoryview(content)[:max_len * 4]).decode('utf-8', 'replace')
+        elif not isinstance(content, str):
+            content = str(content)
+
+        if len(content) <= max_len:
+            return content
+        return content[:max_len] + "... [truncated]"
+
+    def _execute_tool(self, tool_name: str, params: Union[Dict[str, Any], List[Dict[str, Any]]]) -> str:
         """
         Execute a tool with the given parameters.
 
         Args:
             tool_name (str): Name of the tool to execute
-            params (Dict[str, Any]): Parameters for the tool
+            params (Dict[str, Any] or List[Dict[str, Any]]): Parameters for the tool,
+                or one set per call for a batched action
 
         Returns:
             str: Tool execution result or error message
         """
-        # Find the tool (with fuzzy matching)
-        actual_tool_name = None
-        for available_tool in self.tools.keys():
-            if tool_name.lower() == available_tool.lower():
-                actual_tool_name = available_tool
-                break
-            elif tool_name.lower() in available_tool.lower() or available_tool.lower() in tool_name.lower():
-                actual_tool_name = available_tool
-                break
+        # Lowercased tool names, built once per tool set
+        if self._tools_lower is None:
+            self._tools_lower = {name.lower(): name for name in self.tools}
+
+        # Find the tool: exact match first, then fuzzy substring match
+        key = tool_name.lower()
+        actual_tool_name = self._tools_lower.get(key)
+        if actual_tool_name is None:
+            for lower_name, available_tool in self._tools_lower.items():
+                if key in lower_name or lower_name in key:
+                    actual_tool_name = available_tool
+                    break
 
         if not actual_tool_name:
-            return f"Error: Tool '{tool_name}' not found. Available tools: {list(self.tools.keys())}"
+            if self._tools_names_repr is None:
+                self._tools_names_repr = repr(list(self.tools.keys()))
+            return f"Error: Tool '{tool_name}' not found. Available tools: {self._tools_names_repr}"
 
         tool = self.tools[actual_tool_name]
 
+        if isinstance(params, list):
+            return self._execute_batch(actual_tool_name, tool, params)
+        return self._run_tool(actual_tool_name, tool, params)
+
+    def _execute_batch(self, tool_name: str, tool: Any, params_list: List[Dict[str, Any]]) -> str:
+        """
+        Execute one tool once per parameter set and join the observations.
+
+        Args:
+            tool_name (str): Name of the tool
+            tool (Any): Tool instance
+            params_list (List[Dict[str, Any]]): Parameters for each call
+
+        Returns:
+            str: Observations of all calls, in input order
+        """
+        if not params_list:
+            return "Error: Action Input is an empty list"
+
+        # Tools that haven't opted in may write files or share state, so run those in turn
+        if getattr(tool, "supports_batch", False) and len(params_list) > 1:
+            self.logger.debug(f"Running {len(params_list)} calls of '{tool_name}' concurrently")
+            with ThreadPoolExecutor(max_workers=min(_MAX_BATCH_WORKERS, len(params_list))) as executor:
+                observations = list(executor.map(lambda p: self._run_tool(tool_name, tool, p), params_list))
+        else:
+            observations = [self._run_tool(tool_name, tool, p) for p in params_list]
+
+        return _BATCH_SEPARATOR.join(
+            f"[{index}] {observation}" for index, observation in enumerate(observations, 1)
+        )
+
+    def _run_tool(self, tool_name: str, tool: Any, params: Any) -> str:
+        """
+        Run a tool once and format its result as an observation.
+
+        Args:
+            tool_name (str): Name of the tool
+            tool (Any): Tool instance
+            params (Any): Parameters for the tool
+
+        Returns:
+            str: Tool execution result or error message
+        """
+        if not isinstance(params, dict):
+            return f"Error: Expected a JSON object of parameters, got {params!r}"
+
         try:
-            self.logger.debug(f"Executing tool '{actual_tool_name}' with params: {params}")
+            self.logger.debug("Executing tool '%s' with params: %s", tool_name, params)
             result = tool.safe_run(**params)
 
             # Format result for observation
@@ -189,11 +425,7 @@ class ReactAgent(BaseAgent):
                 if 'error' in result:
                     return f"Tool Error: {result['error']}"
                 elif 'content' in result:
-                    # Truncate long content
-                    content = str(result['content'])
-                    if len(content) > 2000:
-                        content = content[:2000] + "... [truncated]"
-                    return content
+                    return self._truncate_observation(result['content'])
                 elif 'result' in result:
                     return str(result['result'])
                 else:
@@ -206,6 +438,18 @@ class ReactAgent(BaseAgent):
             return f"Tool Execution Error: {str(e)}"
 
     def _run(self, task_input: TaskInput) -> TaskOutput:
+        """
+        Execute the ReAct agent from synchronous code.
+
+        Args:
+            task_input (TaskInput): Task input containing the task description
+
+        Returns:
+            TaskOutput: Task output with result and execution trace
+        """
+        return run_coroutine_sync(self._arun(task_input))
+
+    async def _arun(self, task_input: TaskInput) -> TaskOutput:
         """
         Execute the ReAct agent with the given task input.
 
@@ -220,52 +464,64 @@ class ReactAgent(BaseAgent):
         Returns:
             TaskOutput: Task output with result and execution trace
         """
+        # Imported on first run so loading this module doesn't initialize the LLM client
+        from app.llm import llm_manager
+
         task_description = task_input.task_description
         self.logger.info(f"ReAct agent received task: {task_description}")
 
         # Build execution trace
-        trace: List[Dict[str, str]] = []
-        history_text = ""
+        trace: List[_TraceEntry] = []
+        tools_used: List[str] = []
+        # One entry per step; older steps are summarized or dropped to bound the prompt
+        history_steps: List[str] = []
+
+        # The system prompt, tools and task stay fixed for the whole task, so they
+        # form one static prefix that providers can serve from their prompt cache
+        system_prompt = REACT_SYSTEM_PROMPT + "\n" + REACT_CONTEXT_PROMPT.format(
+            tools=self._format_tools_description(),
+            task=task_description
+        )
 
-        # Get tool descriptions
-        tools_description = self._format_tools_description()
+        parse_fail_streak = 0
+        iterations = 0
 
         for iteration in range(self.max_iterations):
+            iterations = iteration + 1
             self.logger.info(f"ReAct iteration {iteration + 1}/{self.max_iterations}")
 
-            # Build prompt for this iteration
-            prompt = REACT_STEP_PROMPT.format(
-                task=task_description,
-                tools=tools_description,
-                history=history_text
-            )
+            # Summarize or drop old steps once the history outgrows the window
+            if len(history_steps) > self.history_window:
+                if self.compress_history:
+                    history_steps = await self._compress_history(history_steps)
+                else:
+                    history_steps = history_steps[-self.history_window:]
+
+            # Build prompt for this iteration in a single join
+            prompt = "".join([REACT_STEP_PREFIX, *history_steps])
 
-            # Generate response from LLM
-            response = llm_manager.generate_text(
+            # Generate response from LLM, ending the stream once the action is complete
+            response = await llm_manager.astream_text(
                 prompt,
-                system_prompt=REACT_SYSTEM_PROMPT
+                system_prompt=system_prompt,
+                stop=_REACT_STOP,
+                until=_RE_ACTION_INPUT_DONE.search
             )
 
             if self.verbose:
-                self.logger.debug(f"LLM Response:\n{response}")
-
-            # Extract thought
-            thought_match = re.search(
-                r'Thought\s*:\s*(.+?)(?=\nAction|\nFinal\s*Answer|$)',
-                response,
-                re.IGNORECASE | re.DOTALL
-            )
-            thought = thought_match.group(1).strip() if thought_match else ""
+                self.logger.debug("LLM Response:\n%s", response)
 
-            # Parse action or final answer
-            action_name, action_params, final_answer = self._parse_action(response)
+            # Parse thought and action or final answer in one pass
+            sections = self._parse_response(response)
+            thought = sections["thought"] or ""
+            action_name, action_params, final_answer = self._action_from_sections(sections)
 
             # Record in trace
-            trace_entry = {"thought": thought}
+            trace_entry = _TraceEntry(thought)
 
             if final_answer:
                 # Task complete
-                trace_entry["final_answer"] = final_answer
+                trace_entry.final_answer = final_answer
                 trace.append(trace_entry)
 
                 self.logger.info(f"ReAct completed with final answer after {iteration + 1} iterations")
@@ -277,44 +533,62 @@ class ReactAgent(BaseAgent):
                     metadata={
                         "agent_type": self.name,
                         "iterations": iteration + 1,
-                        "trace": trace,
-                        "tools_used": [t.get("action") for t in trace if "action" in t]
+                        "trace": [entry.to_dict() for entry in trace],
+                        "tools_used": tools_used
                     }
                 )
 
             if action_name:
+                parse_fail_streak = 0
+
                 # Execute tool
-                trace_entry["action"] = action_name
-                trace_entry["action_input"] = action_params
+                trace_entry.action = action_name
+                trace_entry.action_input = action_params
+                tools_used.append(action_name)
 
-                observation = self._execute_tool(action_name, action_params or {})
-                trace_entry["observation"] = observation
+                # Tools block on I/O, so run them off the event loop
+                observation = await asyncio.to_thread(self._execute_tool, action_name, action_params or {})
+                trace_entry.observation = observation
                 trace.append(trace_entry)
 
                 # Update history for next iteration
-                history_text += f"\nThought: {thought}"
-                history_text += f"\nAction: {action_name}"
-                history_text += f"\nAction Input: {json.dumps(action_params)}"
-                history_text += f"\nObservation: {observation}\n"
+                history_steps.append(
+                    f"\nThought: {thought}"
+                    f"\nAction: {action_name}"
+                    f"\nAction Input: {self._truncate_params_for_history(action_params)}"
+                    f"\nObservation: {observation}\n"
+                )
 
                 if self.verbose:
                     self.logger.info(f"Action: {action_name}")
-                    self.logger.debug(f"Observation: {observation[:200]}...")
+                    self.logger.debug("Observation: %.200s...", observation)
             else:
                 # No valid action or final answer - try to recover
                 trace.append(trace_entry)
 
                 # Add a hint for the next iteration
-                history_text += f"\nThought: {thought}"
-                history_text += "\n[System: Please provide either an Action with Action Input, or a Final Answer]\n"
+                history_steps.append(
+                    f"\nThought: {thought}"
+                    "\n[System: Please provide either an Action with Action Input, or a Final Answer]\n"
+                )
+
+                # The model is stuck; stop paying for more calls
+                parse_fail_streak += 1
+                if parse_fail_streak >= _MAX_PARSE_FAILURES:
+                    self.logger.warning(f"No action parsed {parse_fail_streak} times in a row, stopping early")
+                    break
 
                 self.logger.warning("No valid action or final answer parsed, continuing...")
 
-        # Max iterations reached without final answer
-        self.logger.warning(f"ReAct reached max iterations ({self.max_iterations})")
+        early_stopped = parse_fail_streak >= _MAX_PARSE_FAILURES
+        if not early_stopped:
+            # Max iterations reached without final answer
+            self.logger.warning(f"ReAct reached max iterations ({self.max_iterations})")
+
+        trace_dicts = [entry.to_dict() for entry in trace]
 
         # Generate a summary from the trace
-        summary = self._generate_summary(task_description, trace)
+        summary = await self._generate_summary(task_description, trace_dicts)
 
         return TaskOutput(
             success=True,
@@ -322,14 +596,41 @@ class ReactAgent(BaseAgent):
             conversation=task_input.conversation,
             metadata={
                 "agent_type": self.name,
-                "iterations": self.max_iterations,
-                "trace": trace,
+                "iterations": iterations,
+                "trace": trace_dicts,
+                "tools_used": tools_used,
                 "completed": False,
-                "reason": "max_iterations_reached"
+                "early_stopped": early_stopped,
+                "reason": "repeated_parse_failures" if early_stopped else "max_iterations_reached"
             }
         )
 
-    def _generate_summary(self, task: str, trace: List[Dict]) -> str:
+    async def _compress_history(self, history_steps: List[str]) -> List[str]:
+        """
+        Replace all but the most recent steps with a short LLM-written summary.
+
+        Args:
+            history_steps (List[str]): Formatted history steps, oldest first
+
+        Returns:
+            List[str]: Summary entry followed by the most recent steps verbatim
+        """
+        from app.llm import llm_manager
+
+        old_steps = history_steps[:-_HISTORY_KEEP_RECENT]
+        recent_steps = history_steps[-_HISTORY_KEEP_RECENT:]
+
+        summary = await llm_manager.agenerate_text(
+            REACT_HISTORY_SUMMARY_PROMPT.format(steps="".join(old_steps))
+        )
+        if summary.startswith("Error:"):
+            # Fall back to the plain window, which drops the oldest steps
+            return history_steps[-self.history_window:]
+
+        self.logger.debug(f"Compressed {len(old_steps)} history steps into a summary")
+        return [f"\n[Summary of earlier steps]: {summary.strip()}\n"] + recent_steps
+
+    async def _generate_summary(self, task: str, trace: List[Dict]) -> str:
         """
         Generate a summary when max iterations are reached.
 
@@ -340,18 +641,26 @@ class ReactAgent(BaseAgent):
         Returns:
             str: Summary of what was accomplished
         """
+        from app.llm import llm_manager
+
         # Collect key information from trace
         thoughts = [t.get("thought", "") for t in trace if t.get("thought")]
         observations = [t.get("observation", "") for t in trace if t.get("observation")]
 
+        # Nothing to summarize, so don't pay for another LLM call
+        if not observations:
+            return f"Unable to complete task '{task}' within {self.max_iterations} iterations; no observations gathered."
+
+        recent_observations = "\n".join(observations[-3:])
+
         summary_prompt = f"""Based on the following task and execution trace, provide a comprehensive summary of what was accomplished:
 
 Task: {task}
 
 Key Observations:
-{chr(10).join(observations[-3:])}
+{recent_observations}
 
 Please provide a helpful summary response for the user."""
 
-        summary = llm_manager.generate_text(summary_prompt)
+        summary = await llm_manager.agenerate_text(summary_prompt)
         return summary
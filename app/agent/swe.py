@@ -15,11 +15,23 @@ This agent is optimized for:
 - Test writing and execution
 - File editing and manipulation
 """
-from typing import Any, Dict, List, Optional, Tuple
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+import asyncio
+import copy
+import hashlib
 import re
 import json
+import logging
 
-from app.agent.base import BaseAgent
+# orjson parses and serializes several times faster; fall back to the stdlib if missing
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+from app.agent.base import BaseAgent, run_coroutine_sync
 from app.schema import AgentType, TaskInput, TaskOutput
 from app.llm import llm_manager
 from app.prompt.swe import (
@@ -27,10 +39,74 @@ from app.prompt.swe import (
     SWE_TASK_PROMPT,
     SWE_CODE_GENERATION_PROMPT,
     SWE_TOOL_SELECTION_PROMPT,
-    SWE_DEBUG_PROMPT
+    SWE_DEBUG_PROMPT,
+    SWE_UNDERSTAND_PROMPT,
+    SWE_PLAN_PROMPT
 )
 
 
+# Fields of the task analysis response
+_RE_TASK_TYPE = re.compile(r'TASK_TYPE:\s*(\w+)', re.IGNORECASE)
+_RE_LANGUAGE = re.compile(r'LANGUAGE:\s*(.+?)(?:\n|$)', re.IGNORECASE)
+_RE_COMPLEXITY = re.compile(r'COMPLEXITY:\s*(\w+)', re.IGNORECASE)
+_RE_REQUIREMENTS = re.compile(r'REQUIREMENTS:\s*\n((?:[-*]\s*.+\n?)+)', re.IGNORECASE)
+
+# A line holding a numbered plan step such as "1.", "1)" or "Step 1:", capturing the step text
+_RE_PLAN_STEP = re.compile(r'^[ \t]*(?:\d+[\.\):]|Step[ \t]+\d+:?)[ \t]*(.+)$', re.IGNORECASE | re.MULTILINE)
+
+# Fields of the tool selection response
+_RE_TOOL = re.compile(r'TOOL:\s*(\w+)', re.IGNORECASE)
+_RE_PARAMS = re.compile(r'PARAMETERS:\s*(\{.+?\}|\[.+?\])', re.IGNORECASE | re.DOTALL)
+
+# Language names whose generated code can be run for verification
+_PYTHON_LANGUAGES = frozenset({"python", "py"})
+
+# The first fenced code block of a response
+_RE_CODE_FENCE = re.compile(r'```(?:\w+)?\s*\n(.+?)\n```', re.DOTALL)
+
+
+def _json_loads(text: str) -> Any:
+    """Parse JSON text, raising ValueError if it is invalid."""
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+
+def _json_dumps(value: Any) -> str:
+    """Serialize a value to compact JSON text."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(value).decode("utf-8")
+    return json.dumps(value, separators=(",", ":"))
+
+
+# LRU caches of task analyses and plans, shared across agents; repeated tasks skip the LLM
+_ANALYSIS_CACHE: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_PLAN_CACHE: "OrderedDict[Tuple[Hashable, ...], List[str]]" = OrderedDict()
+_CACHE_SIZE = 256
+
+
+def _task_cache_key(task: str) -> str:
+    """Digest of the task with whitespace normalized, used as a cache key."""
+    normalized = " ".join(task.split())
+    return hashlib.blake2b(normalized.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _cache_get(cache: OrderedDict, key: Hashable) -> Any:
+    """Get a copy of a cached value and mark it as recently used, or None if absent."""
+    value = cache.get(key)
+    if value is None:
+        return None
+    cache.move_to_end(key)
+    return copy.deepcopy(value)
+
+
+def _cache_put(cache: OrderedDict, key: Hashable, value: Any) -> None:
+    """Store a copy of a value, evicting the least recently used entry when full."""
+    cache[key] = copy.deepcopy(value)
+    if len(cache) > _CACHE_SIZE:
+        cache.popitem(last=False)
+
+
 class SWEAgent(BaseAgent):
     """
     Software Engineering agent specialized in code generation and software development tasks.
@@ -63,6 +139,10 @@ class SWEAgent(BaseAgent):
         self.max_iterations = max_iterations
         self.auto_execute = auto_execute
         self.verbose = verbose
+        # Checked once so the detailed debug dumps cost a single attribute read when off
+        self._log_details = verbose and self.logger.isEnabledFor(logging.DEBUG)
+        self._tools_description_cache: Optional[str] = None
+        self._tools_lower: Optional[Dict[str, str]] = None
 
         # Define default tools if none provided
         if not tools:
@@ -77,8 +157,16 @@ class SWEAgent(BaseAgent):
             for tool_name in default_tools:
                 self.add_tool(tool_name)
 
+    def _on_tools_changed(self) -> None:
+        """Drop the cached tool descriptions and name index so they are rebuilt for the new tool set."""
+        self._tools_description_cache = None
+        self._tools_lower = None
+
     def _format_tools_description(self) -> str:
         """Format available tools into a description string."""
+        if self._tools_description_cache is not None:
+            return self._tools_description_cache
+
         tool_descriptions = []
         for tool_name, tool in self.tools.items():
             params_info = ""
@@ -90,7 +178,8 @@ class SWEAgent(BaseAgent):
 
             tool_descriptions.append(f"- {tool_name}: {tool.description}{params_info}")
 
-        return "\n".join(tool_descriptions)
+        self._tools_description_cache = "\n".join(tool_descriptions)
+        return self._tools_description_cache
 
     def _understand_task(self, task: str) -> Dict[str, Any]:
         """
@@ -102,27 +191,16 @@ class SWEAgent(BaseAgent):
         Returns:
             Dict with task analysis
         """
-        prompt = f"""Analyze the following software engineering task and extract key information:
-
-Task: {task}
-
-Please provide:
-1. TASK_TYPE: One of [code_generation, bug_fix, refactoring, testing, documentation, other]
-2. LANGUAGE: Primary programming language (if applicable)
-3. REQUIREMENTS: List of specific requirements
-4. COMPLEXITY: One of [simple, moderate, complex]
-5. DEPENDENCIES: Any external dependencies or context needed
-
-Format your response as:
-TASK_TYPE: [type]
-LANGUAGE: [language or "not specified"]
-REQUIREMENTS:
-- [requirement 1]
-- [requirement 2]
-COMPLEXITY: [complexity]
-DEPENDENCIES: [dependencies or "none"]"""
+        cache_key = _task_cache_key(task)
+        cached = _cache_get(_ANALYSIS_CACHE, cache_key)
+        if cached is not None:
+            self.logger.debug("Reusing cached task analysis")
+            return cached
+
+        prompt = SWE_UNDERSTAND_PROMPT.format(task=task)
 
         response = llm_manager.generate_text(prompt, system_prompt=SWE_SYSTEM_PROMPT)
+        llm_failed = response.startswith("Error:")
 
         # Parse the response
         analysis = {
@@ -134,22 +212,22 @@ DEPENDENCIES: [dependencies or "none"]"""
         }
 
         # Extract task type
-        type_match = re.search(r'TASK_TYPE:\s*(\w+)', response, re.IGNORECASE)
+        type_match = _RE_TASK_TYPE.search(response)
         if type_match:
             analysis["task_type"] = type_match.group(1).lower()
 
         # Extract language
-        lang_match = re.search(r'LANGUAGE:\s*(.+?)(?:\n|$)', response, re.IGNORECASE)
+        lang_match = _RE_LANGUAGE.search(response)
         if lang_match:
             analysis["language"] = lang_match.group(1).strip()
 
         # Extract complexity
-        complex_match = re.search(r'COMPLEXITY:\s*(\w+)', response, re.IGNORECASE)
+        complex_match = _RE_COMPLEXITY.search(response)
         if complex_match:
             analysis["complexity"] = complex_match.group(1).lower()
 
         # Extract requirements
-        req_match = re.search(r'REQUIREMENTS:\s*\n((?:[-*]\s*.+\n?)+)', response, re.IGNORECASE)
+        req_match = _RE_REQUIREMENTS.search(response)
         if req_match:
             reqs = req_match.group(1)
             analysis["requirements"] = [
@@ -158,6 +236,10 @@ DEPENDENCIES: [dependencies or "none"]"""
                 if r.strip()
             ]
 
+        # Don't remember the defaults produced by a failed LLM call
+        if not llm_failed:
+            _cache_put(_ANALYSIS_CACHE, cache_key, analysis)
+
         return analysis
 
     def _create_plan(self, task: str, analysis: Dict[str, Any]) -> List[str]:
@@ -171,38 +253,43 @@ DEPENDENCIES: [dependencies or "none"]"""
         Returns:
             List of implementation steps
         """
-        prompt = f"""Create a detailed implementation plan for the following task:
-
-Task: {task}
-Task Type: {analysis['task_type']}
-Language: {analysis['language']}
-Complexity: {analysis['complexity']}
-
-Requirements:
-{chr(10).join('- ' + r for r in analysis['requirements'])}
-
-Create a step-by-step plan. Each step should be specific and actionable.
-Number each step. Maximum 10 steps.
-
-PLAN:"""
+        cache_key = (
+            _task_cache_key(task),
+            analysis['task_type'],
+            analysis['language'],
+            analysis['complexity'],
+            tuple(analysis['requirements'])
+        )
+        cached = _cache_get(_PLAN_CACHE, cache_key)
+        if cached is not None:
+            self.logger.debug("Reusing cached implementation plan")
+            return cached
+
+        prompt = SWE_PLAN_PROMPT.format(
+            task=task,
+            task_type=analysis['task_type'],
+            language=analysis['language'],
+            complexity=analysis['complexity'],
+            requirements=("- " + "\n- ".join(analysis['requirements'])) if analysis['requirements'] else ""
+        )
 
         response = llm_manager.generate_text(prompt, system_prompt=SWE_SYSTEM_PROMPT)
 
-        # Parse plan steps
-        steps = []
-        for line in response.split('\n'):
-            line = line.strip()
-            # Match numbered steps like "1.", "1)", "Step 1:", etc.
-            if re.match(r'^(\d+[\.\):]|Step\s+\d+)', line, re.IGNORECASE):
-                step = re.sub(r'^(\d+[\.\):]|Step\s+\d+:?)\s*', '', line)
-                if step:
-                    steps.append(step)
+        # Parse numbered steps like "1.", "1)", "Step 1:", etc. in one scan
+        steps = [
+            step for step in (m.group(1).strip() for m in _RE_PLAN_STEP.finditer(response))
+            if step
+        ]
 
         # Fallback: if no numbered steps found, split by sentences
         if not steps:
             steps = [s.strip() for s in response.split('.') if s.strip()][:5]
 
-        return steps[:10]  # Limit to 10 steps
+        steps = steps[:10]  # Limit to 10 steps
+        if not response.startswith("Error:"):
+            _cache_put(_PLAN_CACHE, cache_key, steps)
+
+        return steps
 
     def _select_tool_for_step(self, step: str, context: str) -> Tuple[str, Dict[str, Any]]:
         """
@@ -215,34 +302,88 @@ PLAN:"""
         Returns:
             Tuple of (tool_name, parameters)
         """
-        tools_desc = self._format_tools_description()
+        prompt = self._tool_selection_prompt(step, context)
+        response = llm_manager.generate_text(prompt, system_prompt=SWE_SYSTEM_PROMPT)
+        return self._parse_tool_selection(response)
 
-        prompt = SWE_TOOL_SELECTION_PROMPT.format(
+    async def _aselect_tool_for_step(self, step: str, context: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Select the appropriate tool for a plan step without blocking the event loop.
+
+        Args:
+            step (str): Plan step description
+            context (str): Execution context
+
+        Returns:
+            Tuple of (tool_name, parameters)
+        """
+        prompt = self._tool_selection_prompt(step, context)
+        response = await llm_manager.agenerate_text(prompt, system_prompt=SWE_SYSTEM_PROMPT)
+        return self._parse_tool_selection(response)
+
+    async def _aselect_tools_for_plan(self, plan: List[str], context: str) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Select tools for all plan steps with concurrent LLM calls.
+
+        Args:
+            plan (List[str]): Plan steps
+            context (str): Execution context
+
+        Returns:
+            List of (tool_name, parameters), one per step in plan order
+        """
+        # Selection only reads the analysis, never earlier step results, so the calls are independent
+        return list(await asyncio.gather(*(self._aselect_tool_for_step(step, context) for step in plan)))
+
+    def _tool_selection_prompt(self, step: str, context: str) -> str:
+        """
+        Build the tool selection prompt for a plan step.
+
+        Args:
+            step (str): Plan step description
+            context (str): Execution context
+
+        Returns:
+            Prompt text
+        """
+        return SWE_TOOL_SELECTION_PROMPT.format(
             step=step,
             context=context,
-            tools=tools_desc
+            tools=self._format_tools_description()
         )
 
-        response = llm_manager.generate_text(prompt, system_prompt=SWE_SYSTEM_PROMPT)
+    def _parse_tool_selection(self, response: str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Parse a tool selection response.
 
-        # Parse tool selection
-        tool_match = re.search(r'TOOL:\s*(\w+)', response, re.IGNORECASE)
-        params_match = re.search(r'PARAMETERS:\s*(\{.+?\}|\[.+?\])', response, re.IGNORECASE | re.DOTALL)
+        Args:
+            response (str): LLM response
+
+        Returns:
+            Tuple of (tool_name, parameters)
+        """
+        tool_match = _RE_TOOL.search(response)
+        params_match = _RE_PARAMS.search(response)
 
         tool_name = tool_match.group(1) if tool_match else "code_generator"
         params = {}
 
         if params_match:
             try:
-                params = json.loads(params_match.group(1))
-            except json.JSONDecodeError:
+                params = _json_loads(params_match.group(1))
+            except ValueError:
                 pass
 
-        # Fuzzy match tool name
-        for available_tool in self.tools.keys():
-            if tool_name.lower() == available_tool.lower():
-                return available_tool, params
-            elif tool_name.lower() in available_tool.lower():
+        # Lowercased tool names, built once per tool set
+        if self._tools_lower is None:
+            self._tools_lower = {name.lower(): name for name in self.tools}
+
+        # Find the tool: exact match first, then fuzzy substring match
+        key = tool_name.lower()
+        if key in self._tools_lower:
+            return self._tools_lower[key], params
+        for lower_name, available_tool in self._tools_lower.items():
+            if key in lower_name:
                 return available_tool, params
 
         # Default to code_generator
@@ -265,7 +406,7 @@ PLAN:"""
         tool = self.tools[tool_name]
 
         try:
-            self.logger.debug(f"Executing tool '{tool_name}' with params: {params}")
+            self.logger.debug("Executing tool '%s' with params: %s", tool_name, params)
             result = tool.safe_run(**params)
 
             if isinstance(result, dict):
@@ -276,7 +417,7 @@ PLAN:"""
             return result
 
         except Exception as e:
-            self.logger.error(f"Tool execution error: {str(e)}")
+            self.logger.error("Tool execution error: %s", e)
             return {"error": str(e), "success": False}
 
     def _verify_implementation(self, context: Dict[str, Any]) -> Dict[str, Any]:
@@ -289,27 +430,28 @@ PLAN:"""
         Returns:
             Verification result
         """
+        code = context.get("generated_code", "")
+        language = context.get("language", "").lower()
+
+        # Only generated Python code can be executed; anything else is left unverified
+        if not (self.auto_execute and "python_execute" in self.tools and code and language in _PYTHON_LANGUAGES):
+            return {"success": True, "output": "", "errors": [], "skipped": True}
+
         verification = {
             "success": True,
             "output": "",
             "errors": []
         }
 
-        # If we have generated Python code and auto_execute is enabled
-        if self.auto_execute and "python_execute" in self.tools:
-            code = context.get("generated_code", "")
-            language = context.get("language", "").lower()
-
-            if code and language in ["python", "py"]:
-                self.logger.info("Auto-executing generated Python code for verification")
+        self.logger.info("Auto-executing generated Python code for verification")
 
-                result = self._execute_tool("python_execute", {"code": code})
+        result = self._execute_tool("python_execute", {"code": code})
 
-                if result.get("success"):
-                    verification["output"] = result.get("result", result.get("output", ""))
-                else:
-                    verification["success"] = False
-                    verification["errors"].append(result.get("error", "Execution failed"))
+        if result.get("success"):
+            verification["output"] = result.get("result", result.get("output", ""))
+        else:
+            verification["success"] = False
+            verification["errors"].append(result.get("error", "Execution failed"))
 
         return verification
 
@@ -341,8 +483,9 @@ PLAN:"""
 
         response = llm_manager.generate_text(prompt, system_prompt=SWE_SYSTEM_PROMPT)
 
-        # Extract fixed code from response
-        code_match = re.search(r'```(?:\w+)?\s*\n(.+?)\n```', response, re.DOTALL)
+        # Extract fixed code from response; without a closing fence the search
+        # would rescan the rest of the response from every opening one
+        code_match = _RE_CODE_FENCE.search(response) if response.count("```") >= 2 else None
         if code_match:
             fixed_code = code_match.group(1)
             context["generated_code"] = fixed_code
@@ -352,6 +495,18 @@ PLAN:"""
         return context
 
     def _run(self, task_input: TaskInput) -> TaskOutput:
+        """
+        Execute the SWE agent from synchronous code.
+
+        Args:
+            task_input (TaskInput): Task input containing the task description
+
+        Returns:
+            TaskOutput: Task output with result and artifacts
+        """
+        return run_coroutine_sync(self._arun(task_input))
+
+    async def _arun(self, task_input: TaskInput) -> TaskOutput:
         """
         Execute the SWE agent with the given task input.
 
@@ -365,7 +520,7 @@ PLAN:"""
             TaskOutput: Task output with result and artifacts
         """
         task_description = task_input.task_description
-        self.logger.info(f"SWE agent received task: {task_description}")
+        self.logger.info("SWE agent received task: %s", task_description)
 
         # Execution context
         context = {
@@ -378,7 +533,7 @@ PLAN:"""
 
         # Phase 1: UNDERSTAND
         self.logger.info("Phase 1: UNDERSTAND - Analyzing task")
-        analysis = self._understand_task(task_description)
+        analysis = await asyncio.to_thread(self._understand_task, task_description)
         context["analysis"] = analysis
         context["language"] = analysis.get("language", "python")
         context["execution_trace"].append({
@@ -386,33 +541,30 @@ PLAN:"""
             "result": analysis
         })
 
-        if self.verbose:
-            self.logger.debug(f"Task analysis: {analysis}")
+        if self._log_details:
+            self.logger.debug("Task analysis: %s", analysis)
 
         # Phase 2: PLAN
         self.logger.info("Phase 2: PLAN - Creating implementation plan")
-        plan = self._create_plan(task_description, analysis)
+        plan = await asyncio.to_thread(self._create_plan, task_description, analysis)
         context["plan"] = plan
         context["execution_trace"].append({
             "phase": "PLAN",
             "result": plan
         })
 
-        if self.verbose:
-            self.logger.debug(f"Implementation plan: {plan}")
+        if self._log_details:
+            self.logger.debug("Implementation plan: %s", plan)
 
         # Phase 3: IMPLEMENT
         self.logger.info("Phase 3: IMPLEMENT - Executing plan steps")
         step_results = []
 
-        for i, step in enumerate(plan):
-            self.logger.info(f"Executing step {i + 1}/{len(plan)}: {step[:50]}...")
+        # Select tools for every step up front so the LLM calls overlap
+        selections = await self._aselect_tools_for_plan(plan, _json_dumps(context.get("analysis", {})))
 
-            # Select tool for this step
-            tool_name, params = self._select_tool_for_step(
-                step,
-                json.dumps(context.get("analysis", {}))
-            )
+        for i, (step, (tool_name, params)) in enumerate(zip(plan, selections)):
+            self.logger.info("Executing step %d/%d: %.50s...", i + 1, len(plan), step)
 
             # Add task context to params if using code_generator
             if tool_name == "code_generator" and "description" not in params:
@@ -421,7 +573,7 @@ PLAN:"""
                     params["language"] = context["language"]
 
             # Execute tool
-            result = self._execute_tool(tool_name, params)
+            result = await asyncio.to_thread(self._execute_tool, tool_name, params)
             step_results.append({
                 "step": step,
                 "tool": tool_name,
@@ -444,7 +596,7 @@ PLAN:"""
 
         # Phase 4: VERIFY
         self.logger.info("Phase 4: VERIFY - Testing implementation")
-        verification = self._verify_implementation(context)
+        verification = await asyncio.to_thread(self._verify_implementation, context)
         context["verification"] = verification
         context["execution_trace"].append({
             "phase": "VERIFY",
@@ -455,16 +607,17 @@ PLAN:"""
         iteration = 0
         while not verification["success"] and iteration < self.max_iterations:
             iteration += 1
-            self.logger.info(f"Phase 5: ITERATE - Fixing errors (attempt {iteration})")
+            self.logger.info("Phase 5: ITERATE - Fixing errors (attempt %d)", iteration)
 
-            context = self._iterate_on_errors(
+            context = await asyncio.to_thread(
+                self._iterate_on_errors,
                 task_description,
                 context,
                 verification["errors"]
             )
 
             # Re-verify
-            verification = self._verify_implementation(context)
+            verification = await asyncio.to_thread(self._verify_implementation, context)
             context["verification"] = verification
             context["execution_trace"].append({
                 "phase": f"ITERATE_{iteration}",
@@ -503,41 +656,35 @@ PLAN:"""
         verification = context.get("verification", {})
         files = context.get("generated_files", [])
 
-        summary_parts = []
-
-        # Task summary
-        summary_parts.append(f"## Task Analysis")
-        summary_parts.append(f"- Type: {analysis.get('task_type', 'N/A')}")
-        summary_parts.append(f"- Language: {analysis.get('language', 'N/A')}")
-        summary_parts.append(f"- Complexity: {analysis.get('complexity', 'N/A')}")
-
-        # Plan summary
-        summary_parts.append(f"\n## Implementation Plan")
-        for i, step in enumerate(plan, 1):
-            summary_parts.append(f"{i}. {step}")
+        # Sections are separated by a blank line
+        sections = [
+            "## Task Analysis\n"
+            f"- Type: {analysis.get('task_type', 'N/A')}\n"
+            f"- Language: {analysis.get('language', 'N/A')}\n"
+            f"- Complexity: {analysis.get('complexity', 'N/A')}",
+            "\n".join(["## Implementation Plan"] + [f"{i}. {step}" for i, step in enumerate(plan, 1)])
+        ]
 
         # Generated files
         if files:
-            summary_parts.append(f"\n## Generated Files")
-            for f in files:
-                summary_parts.append(f"- {f}")
+            sections.append("\n".join(["## Generated Files"] + [f"- {f}" for f in files]))
 
         # Verification status
-        summary_parts.append(f"\n## Verification")
+        verification_lines = ["## Verification"]
         if verification.get("success"):
-            summary_parts.append("Status: SUCCESS")
+            verification_lines.append("Status: SUCCESS")
             if verification.get("output"):
-                summary_parts.append(f"Output: {verification['output'][:500]}")
+                verification_lines.append(f"Output: {verification['output'][:500]}")
         else:
-            summary_parts.append("Status: NEEDS REVIEW")
+            verification_lines.append("Status: NEEDS REVIEW")
             if verification.get("errors"):
-                summary_parts.append(f"Issues: {', '.join(verification['errors'][:3])}")
+                verification_lines.append(f"Issues: {', '.join(verification['errors'][:3])}")
+        sections.append("\n".join(verification_lines))
 
         # Generated code preview
         code = context.get("generated_code", "")
         if code:
-            summary_parts.append(f"\n## Generated Code Preview")
-            preview = code[:500] + "..." if len(code) > 500 else code
-            summary_parts.append(f"```{context.get('language', '')}\n{preview}\n```")
+            preview = code if len(code) <= 500 else f"{code[:500]}..."
+            sections.append(f"## Generated Code Preview\n```{context.get('language', '')}\n{preview}\n```")
 
-        return "\n".join(summary_parts)
+        return "\n\n".join(sections)
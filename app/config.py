@@ -1,12 +1,27 @@
+import datetime
 import os
-import toml
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    import tomli as tomllib
 from dotenv import load_dotenv
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Sequence, Tuple
 
 # Load environment variables from .env file
 load_dotenv()
 
+# Marks a key path that is not present in the config
+_MISSING = object()
+
+# Config files checked in order when no path is given; the first is relative,
+# so it resolves against the working directory at load time
+_DEFAULT_CONFIG_PATHS = (
+    Path("config", "config.toml"),
+    Path(__file__).parent.parent / "config" / "config.toml",
+    Path("~/.config/open-agent/config.toml").expanduser(),
+)
+
 class Config:
     """Configuration manager for OpenAgent."""
     
@@ -18,22 +33,17 @@ class Config:
             config_path (str, optional): Path to the config file. If None, default paths will be checked.
         """
         self.config_data: Dict[str, Any] = {}
-        
-        # Default config paths to check
-        default_paths = [
-            os.path.join(os.getcwd(), "config", "config.toml"),
-            os.path.join(os.path.dirname(os.path.dirname(__file__)), "config", "config.toml"),
-            os.path.expanduser("~/.config/open-agent/config.toml"),
-        ]
+        # Resolved key paths; cleared whenever the config is changed through this class
+        self._flat_cache: Dict[Tuple[str, ...], Any] = {}
         
         # Load config file
         if config_path:
             self.load_config(config_path)
         else:
             # Try default paths
-            for path in default_paths:
-                if os.path.exists(path):
-                    self.load_config(path)
+            for path in _DEFAULT_CONFIG_PATHS:
+                if path.is_file():
+                    self.load_config(str(path))
                     break
         
         # Apply environment variable overrides
@@ -50,53 +60,81 @@ class Config:
             config_path (str): Path to the config file
         """
         try:
-            self.config_data = toml.load(config_path)
+            with open(config_path, "rb") as f:
+                self.config_data = tomllib.load(f)
+            self._flat_cache.clear()
         except Exception as e:
             print(f"Error loading config file {config_path}: {e}")
     
     def _apply_env_overrides(self) -> None:
         """Apply environment variable overrides to the config."""
         # API keys
-        if os.environ.get("OPENAI_API_KEY"):
-            self.set_nested_value(["api", "openai_api_key"], os.environ["OPENAI_API_KEY"])
-        
-        if os.environ.get("FIRECRAWL_API_KEY"):
-            self.set_nested_value(["api", "firecrawl_api_key"], os.environ["FIRECRAWL_API_KEY"])
+        openai_api_key = os.environ.get("OPENAI_API_KEY")
+        firecrawl_api_key = os.environ.get("FIRECRAWL_API_KEY")
+        if openai_api_key or firecrawl_api_key:
+            api = self.config_data.setdefault("api", {})
+            if openai_api_key:
+                api["openai_api_key"] = openai_api_key
+            if firecrawl_api_key:
+                api["firecrawl_api_key"] = firecrawl_api_key
         
         # LLM model
-        if os.environ.get("OPENAI_MODEL"):
-            self.set_nested_value(["llm", "model"], os.environ["OPENAI_MODEL"])
+        model = os.environ.get("OPENAI_MODEL")
+        if model:
+            self.config_data.setdefault("llm", {})["model"] = model
+        
+        self._flat_cache.clear()
     
     def _create_required_directories(self) -> None:
         """Create required directories specified in the config."""
         # Document output directories
-        for dir_key in ["pdf_output_dir", "markdown_output_dir", "code_output_dir"]:
-            dir_path = self.get_nested_value(["document", dir_key])
-            if dir_path:
-                Path(dir_path).mkdir(parents=True, exist_ok=True)
+        document = self.config_data.get("document")
+        if isinstance(document, dict):
+            for dir_key in ("pdf_output_dir", "markdown_output_dir", "code_output_dir"):
+                dir_path = document.get(dir_key)
+                if dir_path:
+                    Path(dir_path).mkdir(parents=True, exist_ok=True)
         
         # Log directory
-        log_file = self.get_nested_value(["logging", "file"])
+        log_file = self.get_nested_value(("logging", "file"))
         if log_file:
             log_dir = os.path.dirname(log_file)
             if log_dir:
                 Path(log_dir).mkdir(parents=True, exist_ok=True)
     
-    def get_nested_value(self, keys: list, default: Any = None) -> Any:
+    def get_nested_value(self, keys: Sequence[str], default: Any = None) -> Any:
         """
-        Get a nested value from the config data using a list of keys.
+        Get a nested value from the config data using a sequence of keys.
+        Resolved paths are cached, so repeated reads are a single dict lookup.
         
         Args:
-            keys (list): List of keys to traverse
+            keys (Sequence[str]): Keys to traverse, as a tuple or list
             default (Any, optional): Default value if key is not found
             
         Returns:
             Any: The value at the specified key path or default if not found
         """
+        path = tuple(keys)
+        value = self._flat_cache.get(path, _MISSING)
+        if value is _MISSING:
+            value = self._resolve(path)
+            self._flat_cache[path] = value
+        return default if value is _MISSING else value
+    
+    def _resolve(self, path: Tuple[str, ...]) -> Any:
+        """
+        Walk the config data along a key path.
+        
+        Args:
+            path (Tuple[str, ...]): Keys to traverse
+            
+        Returns:
+            Any: The value at the key path, or _MISSING if not found
+        """
         value = self.config_data
-        for key in keys:
+        for key in path:
             if not isinstance(value, dict) or key not in value:
-                return default
+                return _MISSING
             value = value[key]
         return value
     
@@ -120,6 +158,7 @@ class Config:
         
         # Set the value
         current[keys[-1]] = value
+        self._flat_cache.clear()
     
     def get(self, key: str, default: Any = None) -> Any:
         """
@@ -143,6 +182,7 @@ class Config:
             value (Any): Value to set
         """
         self.config_data[key] = value
+        self._flat_cache.clear()
     
     def __getitem__(self, key: str) -> Any:
         """Dictionary-like access to config values."""
@@ -155,7 +195,6 @@ class Config:
         Returns:
             str: ISO format timestamp string
         """
-        import datetime
         return datetime.datetime.now().isoformat()
 
 
@@ -1,83 +1,75 @@
 class OpenAgentError(Exception):
     """Base exception for OpenAgent errors."""
     
-    def __init__(self, message="An error occurred in OpenAgent"):
-        self.message = message
+    # Message used when none is given; subclasses override this instead of __init__
+    DEFAULT_MESSAGE = "An error occurred in OpenAgent"
+    
+    def __init__(self, message=None):
+        self.message = self.DEFAULT_MESSAGE if message is None else message
         super().__init__(self.message)
 
 
 class ConfigError(OpenAgentError):
     """Exception raised for configuration errors."""
     
-    def __init__(self, message="Configuration error"):
-        super().__init__(message)
+    DEFAULT_MESSAGE = "Configuration error"
 
 
 class LLMError(OpenAgentError):
     """Exception raised for LLM-related errors."""
     
-    def __init__(self, message="LLM error"):
-        super().__init__(message)
+    DEFAULT_MESSAGE = "LLM error"
 
 
 class ToolError(OpenAgentError):
     """Exception raised for tool-related errors."""
     
-    def __init__(self, message="Tool error"):
-        super().__init__(message)
+    DEFAULT_MESSAGE = "Tool error"
 
 
 class AgentError(OpenAgentError):
     """Exception raised for agent-related errors."""
     
-    def __init__(self, message="Agent error"):
-        super().__init__(message)
+    DEFAULT_MESSAGE = "Agent error"
 
 
 class BrowserError(OpenAgentError):
     """Exception raised for browser automation errors."""
     
-    def __init__(self, message="Browser automation error"):
-        super().__init__(message)
+    DEFAULT_MESSAGE = "Browser automation error"
 
 
 class DocumentGenerationError(OpenAgentError):
     """Exception raised for document generation errors."""
     
-    def __init__(self, message="Document generation error"):
-        super().__init__(message)
+    DEFAULT_MESSAGE = "Document generation error"
 
 
 class CodeGenerationError(OpenAgentError):
     """Exception raised for code generation errors."""
     
-    def __init__(self, message="Code generation error"):
-        super().__init__(message)
+    DEFAULT_MESSAGE = "Code generation error"
 
 
 class WebResearchError(OpenAgentError):
     """Exception raised for web research errors."""
     
-    def __init__(self, message="Web research error"):
-        super().__init__(message)
+    DEFAULT_MESSAGE = "Web research error"
 
 
 class APIKeyError(OpenAgentError):
     """Exception raised for API key-related errors."""
     
-    def __init__(self, message="API key error"):
-        super().__init__(message)
+    DEFAULT_MESSAGE = "API key error"
 
 
 class ValidationError(OpenAgentError):
     """Exception raised for validation errors."""
     
-    def __init__(self, message="Validation error"):
-        super().__init__(message)
+    DEFAULT_MESSAGE = "Validation error"
 
 
 class FileOperationError(OpenAgentError):
     """Exception raised for file operation errors."""
     
-    def __init__(self, message="File operation error"):
-        super().__init__(message)
+    DEFAULT_MESSAGE = "File operation error"
@@ -1,16 +1,35 @@
-from typing import Dict, Type, Any
+import importlib
+from typing import Callable, Dict, Tuple, Type, Any
 
 from app.config import Config
 from app.flow.base import BaseFlow
-from app.flow.planning import PlanningFlow
 from app.logger import get_logger
 
 # Registry of available flows
-FLOW_REGISTRY: Dict[str, Type[BaseFlow]] = {
-    "planning": PlanningFlow,
+FLOW_REGISTRY: Dict[str, Type[BaseFlow]] = {}
+
+# Built-in flows as name -> (module, class), imported on first use since
+# their agents pull in the LLM stack
+_BUILTIN_FLOWS: Dict[str, Tuple[str, str]] = {
+    "planning": ("app.flow.planning", "PlanningFlow"),
     # Add more flows here as they are implemented
 }
 
+def register_flow(flow_name: str) -> Callable[[Type[BaseFlow]], Type[BaseFlow]]:
+    """
+    Class decorator that registers a flow under the given name.
+    
+    Args:
+        flow_name (str): Name the flow is created by
+        
+    Returns:
+        Callable[[Type[BaseFlow]], Type[BaseFlow]]: Decorator returning the class unchanged
+    """
+    def decorator(flow_class: Type[BaseFlow]) -> Type[BaseFlow]:
+        FLOW_REGISTRY[flow_name] = flow_class
+        return flow_class
+    return decorator
+
 def create_flow(flow_name: str, config: Config) -> BaseFlow:
     """
     Create a flow instance by name.
@@ -27,8 +46,12 @@ def create_flow(flow_name: str, config: Config) -> BaseFlow:
     """
     logger = get_logger("flow_factory")
     
-    # Check if flow exists in registry
+    # Check if flow exists in registry, importing built-in flows on demand
     flow_class = FLOW_REGISTRY.get(flow_name)
+    if not flow_class and flow_name in _BUILTIN_FLOWS:
+        module_path, class_name = _BUILTIN_FLOWS[flow_name]
+        flow_class = getattr(importlib.import_module(module_path), class_name)
+        FLOW_REGISTRY[flow_name] = flow_class
     if not flow_class:
         logger.error(f"Flow '{flow_name}' not found in registry")
         raise ValueError(f"Unknown flow: {flow_name}")
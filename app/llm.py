@@ -1,14 +1,137 @@
 import os
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, List, Any, Optional, Type
+from langchain_core.callbacks import BaseCallbackHandler
 from langchain_core.language_models import BaseChatModel
+from langchain_core.outputs import LLMResult
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
+from pydantic import BaseModel
 
 from app.config import config
 from app.logger import get_logger
 
 logger = get_logger("llm")
 
+# Anthropic only reuses a cached prompt prefix up to an explicit breakpoint;
+# OpenAI caches stable prefixes automatically and needs no annotation.
+CACHE_CONTROL_EPHEMERAL = {"type": "ephemeral"}
+
+
+def supports_cache_control(llm: Optional[BaseChatModel]) -> bool:
+    """
+    Check whether a chat model accepts explicit cache_control breakpoints.
+    
+    Args:
+        llm (BaseChatModel, optional): Language model instance
+        
+    Returns:
+        bool: True if the model is an Anthropic chat model
+    """
+    # Compare by class name so langchain-anthropic stays an optional dependency
+    return llm is not None and type(llm).__name__ == "ChatAnthropic"
+
+
+def build_system_message(
+    text: str,
+    llm: Optional[BaseChatModel] = None,
+    dynamic_text: Optional[str] = None
+) -> SystemMessage:
+    """
+    Build a system message that providers can serve from their prompt cache.
+    
+    Args:
+        text (str): Static system prompt text
+        llm (BaseChatModel, optional): Model the message will be sent to
+        dynamic_text (str, optional): Text that may change between builds, placed after the static text
+        
+    Returns:
+        SystemMessage: Message with a cache breakpoint after the static text when the provider supports one
+    """
+    if supports_cache_control(llm):
+        blocks = [{"type": "text", "text": text, "cache_control": CACHE_CONTROL_EPHEMERAL}]
+        if dynamic_text:
+            blocks.append({"type": "text", "text": dynamic_text})
+        return SystemMessage(content=blocks)
+    return SystemMessage(content=text + (dynamic_text or ""))
+
+
+def bind_cache_key(llm: BaseChatModel, cache_key: Optional[str]) -> Any:
+    """
+    Tag a model's requests with a prompt cache key where the provider supports one.
+    
+    OpenAI routes requests with the same key to the same cache, so turns of one
+    session that share a prompt prefix keep hitting it.
+    
+    Args:
+        llm (BaseChatModel): Language model instance
+        cache_key (str, optional): Key shared by requests with the same prefix, e.g. a session id
+        
+    Returns:
+        Any: The model bound to the key, or the model unchanged
+    """
+    if cache_key and type(llm).__name__ == "ChatOpenAI":
+        return llm.bind(prompt_cache_key=cache_key)
+    return llm
+
+
+class UsageCollector(BaseCallbackHandler):
+    """Callback handler that accumulates prompt and cached token counts across LLM calls."""
+    
+    # Counters are plain ints, so update them on the loop rather than in a worker thread
+    run_inline = True
+    
+    def __init__(self):
+        """Initialize the usage counters."""
+        super().__init__()
+        self.llm_calls = 0
+        self.prompt_tokens = 0
+        self.cached_tokens = 0
+    
+    def on_llm_end(self, response: LLMResult, **kwargs: Any) -> None:
+        """
+        Record the token usage of a finished LLM call.
+        
+        Args:
+            response (LLMResult): LLM result
+        """
+        self.llm_calls += 1
+        
+        token_usage = (response.llm_output or {}).get("token_usage")
+        if token_usage:
+            self.prompt_tokens += token_usage.get("prompt_tokens") or 0
+            self.cached_tokens += (token_usage.get("prompt_tokens_details") or {}).get("cached_tokens") or 0
+            return
+        
+        # Streamed responses report usage on the message instead
+        for generations in response.generations:
+            for generation in generations:
+                usage = getattr(getattr(generation, "message", None), "usage_metadata", None)
+                if usage:
+                    self.prompt_tokens += usage.get("input_tokens") or 0
+                    self.cached_tokens += (usage.get("input_token_details") or {}).get("cache_read") or 0
+    
+    @property
+    def cache_hit_rate(self) -> float:
+        """Fraction of prompt tokens served from the provider's prompt cache."""
+        if not self.prompt_tokens:
+            return 0.0
+        return self.cached_tokens / self.prompt_tokens
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert the usage to a dictionary for task metadata.
+        
+        Returns:
+            Dict[str, Any]: Usage counters
+        """
+        return {
+            "llm_calls": self.llm_calls,
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_tokens,
+            "cache_hit_rate": round(self.cache_hit_rate, 4),
+        }
+
+
 def get_llm_from_config(config_data: Dict[str, Any] = None) -> BaseChatModel:
     """
     Create a language model instance from configuration.
@@ -63,6 +186,9 @@ class LLMManager:
         """
         self.llm = llm or get_llm_from_config(config_data)
         self.logger = get_logger("llm_manager")
+        # Structured-output runnables keyed by schema, rebuilt if the model is swapped
+        self._structured_llms: Dict[Type[BaseModel], Any] = {}
+        self._structured_llm_source: Optional[BaseChatModel] = None
     
     def generate_text(self, prompt: str, system_prompt: Optional[str] = None) -> str:
         """
@@ -75,21 +201,137 @@ class LLMManager:
         Returns:
             str: Generated text
         """
-        messages = []
+        messages = self._build_messages(prompt, system_prompt)
         
-        if system_prompt:
-            messages.append(SystemMessage(content=system_prompt))
+        try:
+            self.logger.debug("Sending prompt to LLM: %.100s...", prompt)
+            result = self.llm.invoke(messages)
+            return result.content
+        except Exception as e:
+            self.logger.error(f"Error generating text: {e}")
+            return f"Error: {str(e)}"
+    
+    async def agenerate_text(self, prompt: str, system_prompt: Optional[str] = None) -> str:
+        """
+        Generate text using the LLM without blocking the event loop.
         
-        messages.append(HumanMessage(content=prompt))
+        Args:
+            prompt (str): User prompt
+            system_prompt (str, optional): System prompt
+            
+        Returns:
+            str: Generated text
+        """
+        messages = self._build_messages(prompt, system_prompt)
         
         try:
-            self.logger.debug(f"Sending prompt to LLM: {prompt[:100]}...")
-            result = self.llm.invoke(messages)
+            self.logger.debug("Sending prompt to LLM: %.100s...", prompt)
+            result = await self.llm.ainvoke(messages)
             return result.content
         except Exception as e:
             self.logger.error(f"Error generating text: {e}")
             return f"Error: {str(e)}"
     
+    async def astream_text(
+        self,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        stop: Optional[List[str]] = None,
+        until: Optional[Callable[[str], bool]] = None
+    ) -> str:
+        """
+        Stream text from the LLM, ending early once the caller has what it needs.
+        
+        Args:
+            prompt (str): User prompt
+            system_prompt (str, optional): System prompt
+            stop (List[str], optional): Stop sequences applied by the provider
+            until (Callable[[str], bool], optional): Checked against the text so far
+                whenever a line completes; returning True closes the stream
+            
+        Returns:
+            str: Generated text
+        """
+        messages = self._build_messages(prompt, system_prompt)
+        parts = []
+        
+        try:
+            self.logger.debug("Streaming prompt to LLM: %.100s...", prompt)
+            async for chunk in self.llm.astream(messages, stop=stop):
+                if not isinstance(chunk.content, str) or not chunk.content:
+                    continue
+                parts.append(chunk.content)
+                # Leaving the loop closes the stream, so no further tokens are decoded
+                if until is not None and "\n" in chunk.content and until("".join(parts)):
+                    break
+            return "".join(parts)
+        except Exception as e:
+            self.logger.error(f"Error streaming text: {e}")
+            return f"Error: {str(e)}"
+    
+    async def agenerate_structured(
+        self,
+        prompt: str,
+        schema: Type[BaseModel],
+        system_prompt: Optional[str] = None
+    ) -> Optional[BaseModel]:
+        """
+        Generate a response parsed into a Pydantic schema.
+        
+        Args:
+            prompt (str): User prompt
+            schema (Type[BaseModel]): Schema the response must follow
+            system_prompt (str, optional): System prompt
+            
+        Returns:
+            Optional[BaseModel]: Parsed response, or None if generation failed
+        """
+        messages = self._build_messages(prompt, system_prompt)
+        
+        try:
+            self.logger.debug("Sending structured prompt to LLM: %.100s...", prompt)
+            return await self._get_structured_llm(schema).ainvoke(messages)
+        except Exception as e:
+            self.logger.error(f"Error generating structured output: {e}")
+            return None
+    
+    def _get_structured_llm(self, schema: Type[BaseModel]) -> Any:
+        """
+        Get a runnable that returns responses parsed into the schema.
+        
+        Args:
+            schema (Type[BaseModel]): Output schema
+            
+        Returns:
+            Any: Structured-output runnable
+        """
+        if self._structured_llm_source is not self.llm:
+            self._structured_llms.clear()
+            self._structured_llm_source = self.llm
+        if schema not in self._structured_llms:
+            self._structured_llms[schema] = self.llm.with_structured_output(schema)
+        return self._structured_llms[schema]
+    
+    def _build_messages(self, prompt: str, system_prompt: Optional[str] = None) -> List[Any]:
+        """
+        Build the message list for a single prompt.
+        
+        Args:
+            prompt (str): User prompt
+            system_prompt (str, optional): System prompt
+            
+        Returns:
+            List[Any]: LangChain messages
+        """
+        messages = []
+        
+        if system_prompt:
+            # Callers pass fixed system prompts, so mark them cacheable where supported
+            messages.append(build_system_message(system_prompt, self.llm))
+        
+        messages.append(HumanMessage(content=prompt))
+        return messages
+    
     def generate_from_messages(self, messages: List[Dict[str, str]]) -> str:
         """
         Generate text from a list of messages.
@@ -107,7 +349,7 @@ class LLMManager:
             content = message.get("content", "")
             
             if role == "system":
-                langchain_messages.append(SystemMessage(content=content))
+                langchain_messages.append(build_system_message(content, self.llm))
             elif role == "user":
                 langchain_messages.append(HumanMessage(content=content))
             elif role == "assistant":
@@ -27,13 +27,20 @@ def setup_logger(name, level=logging.INFO, log_file=None, rotation='midnight', f
     
     formatter = logging.Formatter(format_str)
     
+    # Agents and tools ask for their logger on every construction; add each handler only
+    # once so repeated calls don't stack handlers and emit each record several times
+    
     # Console handler
-    console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    if not any(type(h) is logging.StreamHandler for h in logger.handlers):
+        console_handler = logging.StreamHandler(sys.stdout)
+        console_handler.setFormatter(formatter)
+        logger.addHandler(console_handler)
     
-    # File handler (if log file is specified)
-    if log_file:
+    # File handler (if log file is specified and not attached yet)
+    if log_file and not any(
+        isinstance(h, logging.FileHandler) and h.baseFilename == os.path.abspath(log_file)
+        for h in logger.handlers
+    ):
         # Create directory if it doesn't exist
         log_dir = os.path.dirname(log_file)
         if log_dir:
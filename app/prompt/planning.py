@@ -1,20 +1,18 @@
 PLANNING_PROMPT = """
 You are a planning assistant that helps break down tasks into clear, actionable steps.
-Given the following task, create a step-by-step plan to accomplish it.
-
-Task: {task}
-
+Given the task below, create a step-by-step plan to accomplish it.
 Please provide a detailed plan with specific steps. Each step should be clear and actionable.
 Focus on what needs to be done, not how to do it.
+
+Task: {task}
 """
 
 EXECUTION_PROMPT = """
 You are an execution assistant that helps carry out plans.
-You have the following plan to execute:
-
-{plan}
-
-Your task is to execute each step of the plan in order.
+Your task is to execute each step of the plan below in order.
 For each step, describe what you're doing and provide the result.
 If a step cannot be completed, explain why and suggest an alternative approach.
+
+Plan:
+{plan}
 """
@@ -24,21 +24,31 @@ IMPORTANT RULES:
 4. Provide Final Answer only when you have completed the task or have enough information
 5. Be concise but thorough in your reasoning
 6. If a tool fails, reason about alternatives in your next Thought
+7. To run the same tool several times with different parameters, give Action Input as a JSON list of parameter objects
 
 Available tools will be provided in the task context.
 """
 
-REACT_STEP_PROMPT = """Task: {task}
-
-Available Tools:
+# Fixed for the whole task: sent with the system prompt so every iteration
+# shares the same cacheable prefix. Tools come first since they rarely change.
+REACT_CONTEXT_PROMPT = """Available Tools:
 {tools}
 
-{history}
+Task: {task}"""
 
-Now continue with your next step. Remember to use the ReAct format:
+# Per-iteration message; the growing history goes last. The agent appends the
+# history to the prefix directly, which skips str.format on every iteration.
+REACT_STEP_PREFIX = """Continue with your next step. Remember to use the ReAct format:
 - If you need to use a tool: Thought -> Action -> Action Input
-- If you have the final answer: Thought -> Final Answer"""
+- If you have the final answer: Thought -> Final Answer
+"""
+REACT_STEP_PROMPT = REACT_STEP_PREFIX + "{history}"
+
+# The observation goes after the instruction so the message starts the same way every time
+REACT_OBSERVATION_PROMPT = """Based on this observation, continue with your next step.
 
-REACT_OBSERVATION_PROMPT = """Observation: {observation}
+Observation: {observation}"""
 
-Based on this observation, continue with your next step."""
+REACT_HISTORY_SUMMARY_PROMPT = """Summarize the following agent steps in at most 200 tokens.
+Keep tool names, key findings and any file paths; drop reasoning that led nowhere.
+{steps}"""
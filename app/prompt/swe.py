@@ -74,14 +74,7 @@ Task: {task}
 Respond with a comprehensive solution that demonstrates software engineering excellence.
 """
 
-SWE_TASK_PROMPT = """Task: {task}
-
-Available Tools:
-{tools}
-
-{context}
-
-Please proceed with the task following the SWE workflow:
+SWE_TASK_PROMPT = """Proceed with the task below following the SWE workflow:
 1. UNDERSTAND - Analyze the requirements
 2. PLAN - Create an implementation plan
 3. IMPLEMENT - Write or edit code
@@ -93,48 +86,93 @@ UNDERSTANDING: [Your analysis of the task]
 PLAN: [Your implementation steps]
 IMPLEMENTATION: [Your code or actions]
 VERIFICATION: [Test results or verification steps]
-SUMMARY: [What was accomplished]"""
+SUMMARY: [What was accomplished]
 
-SWE_CODE_GENERATION_PROMPT = """Generate code for the following requirement:
+Available Tools:
+{tools}
 
-{requirement}
+---
+{context}
 
-Language: {language}
+Task: {task}"""
+
+SWE_CODE_GENERATION_PROMPT = """Generate code for the requirement below.
 
 Requirements:
 - Write clean, well-documented code
 - Include proper error handling
-- Follow {language} best practices and conventions
+- Follow the language's best practices and conventions
 - Add comments explaining complex logic
 - Include example usage if appropriate
 
-Please provide the complete implementation."""
+Please provide the complete implementation.
 
-SWE_DEBUG_PROMPT = """Debug the following code that is producing an error:
+Language: {language}
 
-Code:
-```{language}
-{code}
-```
+{requirement}"""
 
-Error:
-{error}
+# Instructions come first and the task-specific parts last, so every call
+# shares a static prefix that providers can serve from their prompt cache
+SWE_UNDERSTAND_PROMPT = """Analyze the following software engineering task and extract key information.
+
+Please provide:
+1. TASK_TYPE: One of [code_generation, bug_fix, refactoring, testing, documentation, other]
+2. LANGUAGE: Primary programming language (if applicable)
+3. REQUIREMENTS: List of specific requirements
+4. COMPLEXITY: One of [simple, moderate, complex]
+5. DEPENDENCIES: Any external dependencies or context needed
+
+Format your response as:
+TASK_TYPE: [type]
+LANGUAGE: [language or "not specified"]
+REQUIREMENTS:
+- [requirement 1]
+- [requirement 2]
+COMPLEXITY: [complexity]
+DEPENDENCIES: [dependencies or "none"]
+
+Task: {task}"""
+
+SWE_PLAN_PROMPT = """Create a detailed implementation plan for the task below.
+Create a step-by-step plan. Each step should be specific and actionable.
+Number each step. Maximum 10 steps.
+
+Task: {task}
+Task Type: {task_type}
+Language: {language}
+Complexity: {complexity}
+
+Requirements:
+{requirements}
+
+PLAN:"""
+
+SWE_DEBUG_PROMPT = """Debug the code below that is producing an error.
 
 Please:
 1. Identify the root cause of the error
 2. Explain why the error occurs
 3. Provide the corrected code
-4. Explain the fix"""
+4. Explain the fix
 
-SWE_TOOL_SELECTION_PROMPT = """Given the following task step, select the most appropriate tool and parameters:
+Code:
+```{language}
+{code}
+```
 
-Task Step: {step}
-Context: {context}
+Error:
+{error}"""
 
-Available Tools:
-{tools}
+# The tool list is fixed per agent, so it sits before the per-step text
+SWE_TOOL_SELECTION_PROMPT = """Given a task step, select the most appropriate tool and parameters.
 
 Respond with:
 TOOL: [tool_name]
 PARAMETERS: [JSON parameters for the tool]
-REASONING: [Why this tool is appropriate]"""
+REASONING: [Why this tool is appropriate]
+
+Available Tools:
+{tools}
+
+Task Step: {step}
+Context: {context}"""
@@ -64,6 +64,12 @@ class TaskInput(BaseModel):
     parameters: Optional[Dict[str, Any]] = Field(None, description="Optional parameters for the task")
 
 
+class TaskPlan(BaseModel):
+    """Structured classification of user input, with a plan when it is a task."""
+    is_task: bool = Field(..., description="True if the input requires actions, False for a question or conversation")
+    steps: List[str] = Field(default_factory=list, description="Clear, specific steps to complete the task, in order")
+
+
 class WebResearchInput(BaseModel):
     """Input for web research tasks."""
     query: str = Field(..., description="Research query or URL to crawl")
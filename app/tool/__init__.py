@@ -1,49 +1,43 @@
 """
 Tool module for OpenAgent.
+
+Tool classes are imported on first access so that importing the package
+doesn't pull in heavy optional dependencies (selenium, reportlab, ...).
 """
+import importlib
+
 from app.tool.base import BaseTool, ToolRegistry
-from app.tool.file_saver import FileSaverTool
-from app.tool.browser_use_tool import BrowserTool
 
-# Try/except imports for tools that have external dependencies
 registry = ToolRegistry()
 
-# Register core tools
-registry.register(FileSaverTool())
-registry.register(BrowserTool())
-
-# Try to import and register other tools with external dependencies
-try:
-    from app.tool.pdf_generator import PDFGeneratorTool, create_pdf_generator_from_input
-    registry.register(PDFGeneratorTool())
-except ImportError as e:
-    print(f"Warning: Could not import PDFGeneratorTool: {e}")
-
-try:
-    from app.tool.markdown_generator import MarkdownGeneratorTool, create_markdown_from_input
-    registry.register(MarkdownGeneratorTool())
-except ImportError as e:
-    print(f"Warning: Could not import MarkdownGeneratorTool: {e}")
-
-try:
-    from app.tool.code_generator import CodeGeneratorTool, generate_code_from_input
-    registry.register(CodeGeneratorTool())
-except ImportError as e:
-    print(f"Warning: Could not import CodeGeneratorTool: {e}")
-
-try:
-    from app.tool.firecrawl_research import FirecrawlResearchTool, conduct_web_research
-    registry.register(FirecrawlResearchTool())
-except ImportError as e:
-    print(f"Warning: Could not import FirecrawlResearchTool: {e}")
-
-try:
-    from app.tool.google_search import GoogleSearchTool
-    registry.register(GoogleSearchTool())
-except ImportError as e:
-    print(f"Warning: Could not import GoogleSearchTool: {e}")
-
-__all__ = [
+# Public name -> module that defines it, imported on first attribute access
+_LAZY_ATTRIBUTES = {
+    'FileSaverTool': 'app.tool.file_saver',
+    'BrowserTool': 'app.tool.browser_use_tool',
+    'PDFGeneratorTool': 'app.tool.pdf_generator',
+    'create_pdf_generator_from_input': 'app.tool.pdf_generator',
+    'MarkdownGeneratorTool': 'app.tool.markdown_generator',
+    'create_markdown_from_input': 'app.tool.markdown_generator',
+    'CodeGeneratorTool': 'app.tool.code_generator',
+    'generate_code_from_input': 'app.tool.code_generator',
+    'FirecrawlResearchTool': 'app.tool.firecrawl_research',
+    'conduct_web_research': 'app.tool.firecrawl_research',
+    'GoogleSearchTool': 'app.tool.google_search',
+    'CreateChatCompletionTool': 'app.tool.create_chat_completion',
+}
+
+
+def __getattr__(name):
+    module_path = _LAZY_ATTRIBUTES.get(name)
+    if module_path is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_path), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+__all__ = (
     'BaseTool', 'ToolRegistry', 'registry',
     'FileSaverTool', 'BrowserTool',
     # These may or may not be available depending on imports
@@ -52,4 +46,4 @@ __all__ = [
     # Functions for direct usage
     'create_markdown_from_input', 'create_pdf_generator_from_input',
     'generate_code_from_input', 'conduct_web_research'
-]
+)
@@ -0,0 +1,123 @@
+import asyncio
+import functools
+from concurrent.futures import Executor
+from typing import Any, Callable, Coroutine, Dict, Optional
+
+from app.logger import get_logger
+
+# HTTP statuses worth retrying: rate limited and temporarily unavailable
+_TRANSIENT_STATUS_CODES = frozenset({429, 503})
+
+
+def _status_code(error: BaseException) -> Optional[int]:
+    """
+    Get the HTTP status code carried by an error, if any.
+
+    Args:
+        error (BaseException): Error to inspect
+
+    Returns:
+        Optional[int]: Status code from the error or its response, or None
+    """
+    # openai/httpx errors expose status_code, urllib's HTTPError status, requests' errors a response
+    for source in (error, getattr(error, "response", None)):
+        for attr in ("status_code", "status"):
+            code = getattr(source, attr, None)
+            if isinstance(code, int):
+                return code
+    return None
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Check whether an error is likely to succeed on retry.
+
+    Args:
+        error (BaseException): Error raised by a tool
+
+    Returns:
+        bool: True for connection failures, timeouts and HTTP 429/503 responses
+    """
+    # BaseTool.run wraps the original exception, so look at the whole chain
+    while error is not None:
+        if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+            return True
+        if _status_code(error) in _TRANSIENT_STATUS_CODES:
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+class AsyncCaller:
+    """
+    Runs blocking tool calls off the event loop with bounded concurrency
+    and exponential-backoff retries on transient errors.
+    """
+
+    def __init__(self, max_concurrency: int = 4, max_retries: int = 6, executor: Optional[Executor] = None):
+        """
+        Initialize the caller.
+
+        Args:
+            max_concurrency (int): Maximum number of calls running at once
+            max_retries (int): Maximum number of retries after a transient error
+            executor (Executor, optional): Pool to run calls in; the loop's default pool if None
+        """
+        self.max_concurrency = max_concurrency
+        self.max_retries = max_retries
+        self.executor = executor
+        self.logger = get_logger("async_caller")
+        # Semaphores bind to the loop they first wait on, so keep one per loop
+        self._semaphores: Dict[asyncio.AbstractEventLoop, asyncio.Semaphore] = {}
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Get the semaphore for the running event loop."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._semaphores = {l: sem for l, sem in self._semaphores.items() if not l.is_closed()}
+            self._semaphores[loop] = semaphore
+        return semaphore
+
+    async def call(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Call a blocking function in a worker thread, retrying transient failures.
+
+        Args:
+            func (Callable[..., Any]): Function to call
+            *args: Positional arguments for the function
+            **kwargs: Keyword arguments for the function
+
+        Returns:
+            Any: Result of the function
+        """
+        attempt = 0
+        while True:
+            try:
+                async with self._get_semaphore():
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+            except Exception as e:
+                if attempt >= self.max_retries or not is_transient_error(e):
+                    raise
+                delay = 2 ** attempt
+                attempt += 1
+                self.logger.warning(f"Transient error ({e}), retry {attempt}/{self.max_retries} in {delay}s")
+                # Back off outside the semaphore so other calls can proceed
+                await asyncio.sleep(delay)
+
+    def wrap(self, func: Callable[..., Any]) -> Callable[..., Coroutine[Any, Any, Any]]:
+        """
+        Wrap a blocking function as a coroutine function routed through this caller.
+
+        Args:
+            func (Callable[..., Any]): Function to wrap
+
+        Returns:
+            Callable[..., Coroutine[Any, Any, Any]]: Async wrapper
+        """
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            return await self.call(func, *args, **kwargs)
+        return wrapper
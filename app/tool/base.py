@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Callable
+import importlib
+from typing import Any, Dict, List, Optional, Callable, Tuple
 
 from app.logger import get_logger
 from app.exceptions import ToolError
@@ -8,6 +9,9 @@ from app.exceptions import ToolError
 class BaseTool(ABC):
     """Base class for all tools in the system."""
     
+    # Whether several calls may run concurrently, e.g. for a batched ReAct action
+    supports_batch = False
+    
     def __init__(self, name: str, description: str, parameters: Optional[Dict[str, Any]] = None):
         """
         Initialize a tool.
@@ -60,7 +64,7 @@ class BaseTool(ABC):
             Any: Result of the tool execution
         """
         try:
-            self.logger.debug(f"Running tool '{self.name}' with args: {kwargs}")
+            self.logger.debug("Running tool '%s' with args: %s", self.name, kwargs)
             
             # Special handling for firecrawl_research tool to ensure query parameter is present
             if self.name == "firecrawl_research" and "query" not in kwargs:
@@ -97,7 +101,7 @@ class BaseTool(ABC):
             Any: Result of the tool execution
         """
         # Log what's being passed for debugging
-        self.logger.debug(f"Safe run called with args: {args}, kwargs: {kwargs}")
+        self.logger.debug("Safe run called with args: %s, kwargs: %s", args, kwargs)
         
         # Handle parameter name differences for certain tools
         if self.name == "browser":
@@ -167,7 +171,7 @@ class BaseTool(ABC):
         
         # Handle special case for firecrawl_research tool
         if self.name == "firecrawl_research":
-            self.logger.debug(f"Handling firecrawl_research tool, kwargs: {kwargs}")
+            self.logger.debug("Handling firecrawl_research tool, kwargs: %s", kwargs)
             
             # Check if query parameter is missing but we have another parameter that could be used
             if 'query' not in kwargs:
@@ -227,6 +231,8 @@ class ToolRegistry:
         if cls._instance is None:
             cls._instance = super(ToolRegistry, cls).__new__(cls)
             cls._instance.tools = {}
+            # Tools registered by name whose modules haven't been imported yet
+            cls._instance._pending: Dict[str, Tuple[str, str]] = {}
         return cls._instance
     
     def register(self, tool: BaseTool) -> None:
@@ -239,10 +245,57 @@ class ToolRegistry:
         if tool.name in self.tools:
             get_logger("tool_registry").warning(f"Tool '{tool.name}' already registered, overwriting")
         self.tools[tool.name] = tool
+        self._pending.pop(tool.name, None)
+    
+    def register_lazy(self, name: str, module_path: str, class_name: str) -> None:
+        """
+        Register a tool that is imported and instantiated on first use.
+        
+        Args:
+            name (str): Tool name
+            module_path (str): Module defining the tool class
+            class_name (str): Name of the tool class
+        """
+        self._pending[name] = (module_path, class_name)
+    
+    def _load(self, name: str) -> Optional[BaseTool]:
+        """
+        Import and register a lazily registered tool.
+        
+        Args:
+            name (str): Tool name
+            
+        Returns:
+            Optional[BaseTool]: The tool, or None if it could not be loaded
+        """
+        module_path, class_name = self._pending.pop(name)
+        try:
+            tool_class = getattr(importlib.import_module(module_path), class_name)
+            tool = tool_class()
+        except (ImportError, AttributeError) as e:
+            get_logger("tool_registry").warning(f"Failed to load tool '{name}': {e}")
+            return None
+        self.tools[name] = tool
+        return tool
+    
+    def _load_all(self) -> None:
+        """Import every lazily registered tool."""
+        for name in list(self._pending):
+            self._load(name)
+    
+    @property
+    def names(self) -> List[str]:
+        """
+        Names of all registered tools, including ones not loaded yet.
+        
+        Returns:
+            List[str]: Tool names
+        """
+        return list(self.tools) + [name for name in self._pending if name not in self.tools]
     
     def get(self, name: str) -> Optional[BaseTool]:
         """
-        Get a tool by name.
+        Get a tool by name, loading it first if it was registered lazily.
         
         Args:
             name (str): Tool name
@@ -250,7 +303,10 @@ class ToolRegistry:
         Returns:
             Optional[BaseTool]: The tool if found, None otherwise
         """
-        return self.tools.get(name)
+        tool = self.tools.get(name)
+        if tool is None and name in self._pending:
+            tool = self._load(name)
+        return tool
     
     def list_tools(self) -> List[Dict[str, Any]]:
         """
@@ -259,8 +315,10 @@ class ToolRegistry:
         Returns:
             List[Dict[str, Any]]: List of tool dictionaries
         """
+        self._load_all()
         return [tool.to_dict() for tool in self.tools.values()]
     
     def clear(self) -> None:
         """Clear all registered tools."""
         self.tools = {}
+        self._pending = {}
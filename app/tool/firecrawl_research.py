@@ -31,6 +31,9 @@ except ImportError:
 class FirecrawlResearchTool(BaseTool):
     """Tool for conducting web research using the Firecrawl API."""
     
+    # Read-only lookups, safe to run side by side
+    supports_batch = True
+    
     def __init__(self):
         """Initialize the Firecrawl research tool."""
         super().__init__(
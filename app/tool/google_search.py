@@ -16,6 +16,9 @@ from app.llm import llm_manager
 class GoogleSearchTool(BaseTool):
     """Tool for performing Google searches."""
     
+    # Read-only lookups, safe to run side by side
+    supports_batch = True
+    
     def __init__(self):
         """Initialize the Google search tool."""
         super().__init__(
@@ -1,42 +1,45 @@
 """
 Tool collection module for registering all available tools in the system.
 """
+import importlib.util
+
 from app.tool.base import ToolRegistry
 from app.logger import get_logger
 
 logger = get_logger("tool_collection")
 
-# Import core tools that should always be available
-from app.tool.file_saver import FileSaverTool
-try:
-    from app.tool.browser_use_tool import BrowserTool
-except ImportError:
-    logger.warning("Unable to import BrowserTool")
-    BrowserTool = None
-
 # Registry singleton
 registry = ToolRegistry()
 
+# Tool name -> (module, class, third-party modules it can't import without);
+# modules are only imported when a tool is first used. Tools that degrade
+# gracefully without an optional package don't list it.
+TOOL_SPECS = {
+    "file_saver": ("app.tool.file_saver", "FileSaverTool", ()),
+    "browser": ("app.tool.browser_use_tool", "BrowserTool", ("selenium", "webdriver_manager")),
+    "pdf_generator": ("app.tool.pdf_generator", "PDFGeneratorTool", ()),
+    "markdown_generator": ("app.tool.markdown_generator", "MarkdownGeneratorTool", ()),
+    "code_generator": ("app.tool.code_generator", "CodeGeneratorTool", ()),
+    "firecrawl_research": ("app.tool.firecrawl_research", "FirecrawlResearchTool", ()),
+    "google_search": ("app.tool.google_search", "GoogleSearchTool", ("requests",)),
+    "planning": ("app.tool.planning", "PlanningTool", ()),
+}
+
 def register_all_tools():
     """Register all available tools in the tool registry."""
     # Clear existing tools to avoid duplicates
     registry.clear()
     
-    # Register core tools
-    registry.register(FileSaverTool())
-    if BrowserTool:
-        registry.register(BrowserTool())
-    
-    # Try to register tools with external dependencies
-    try_register_tool("app.tool.pdf_generator", "PDFGeneratorTool")
-    try_register_tool("app.tool.markdown_generator", "MarkdownGeneratorTool")
-    try_register_tool("app.tool.code_generator", "CodeGeneratorTool")
-    try_register_tool("app.tool.firecrawl_research", "FirecrawlResearchTool")
-    try_register_tool("app.tool.google_search", "GoogleSearchTool")
-    try_register_tool("app.tool.planning", "PlanningTool")
+    for name, (module_path, class_name, requires) in TOOL_SPECS.items():
+        # find_spec only locates the package, so this costs no imports
+        missing = [module for module in requires if importlib.util.find_spec(module) is None]
+        if missing:
+            logger.debug(f"Skipping tool '{name}': missing {', '.join(missing)}")
+            continue
+        registry.register_lazy(name, module_path, class_name)
     
     # Log registered tools
-    logger.info(f"Registered {len(registry.tools)} tools")
+    logger.info(f"Registered {len(registry.names)} tools")
     
     return registry
 
@@ -49,10 +52,6 @@ def try_register_tool(module_path, class_name):
         logger.debug(f"Registered tool: {class_name}")
     except (ImportError, AttributeError) as e:
         logger.warning(f"Failed to register {class_name}: {str(e)}")
-        
-    # Log successful registrations
-    if class_name == "CodeGeneratorTool" and class_name in registry.tools:
-        logger.info("Successfully registered CodeGeneratorTool")
 
 def get_tool_registry():
     """Get the tool registry with all tools registered."""
@@ -1,4 +1,13 @@
+import argparse
 import asyncio
+import sys
+import threading
+from pathlib import Path
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
 
 from app.agent.manus import Manus
 from app.logger import get_logger
@@ -6,20 +15,97 @@ from app.logger import get_logger
 logger = get_logger("open-agent")
 
 
+def parse_args():
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Run the OpenAgent assistant")
+    parser.add_argument("--batch-file", type=str, help="Run each non-empty line of this file as a prompt, concurrently")
+    
+    return parser.parse_args()
+
+
+async def run_batch(agent: Manus, batch_file: str):
+    """Run every prompt in a file and print the results in order."""
+    prompts = [line for line in Path(batch_file).read_text(encoding="utf-8").splitlines() if line.strip()]
+    logger.info(f"Running {len(prompts)} prompts from {batch_file}")
+    results = await agent.run_batch(prompts)
+    for prompt, result in zip(prompts, results):
+        output = result.result if result.success else f"Error: {result.error}"
+        print(f"\n>>> {prompt}\n{output}\n")
+
+
+async def read_input(message: str) -> str:
+    """
+    Read a line from stdin without blocking the event loop.
+    
+    The read runs on a daemon thread rather than the loop's executor, so a
+    pending input() never holds up interpreter shutdown after Ctrl-C.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+    
+    def deliver(setter, value):
+        if not future.done():
+            setter(value)
+    
+    def read():
+        try:
+            line = input(message)
+        except Exception as e:
+            callback = (deliver, future.set_exception, e)
+        else:
+            callback = (deliver, future.set_result, line)
+        try:
+            loop.call_soon_threadsafe(*callback)
+        except RuntimeError:
+            # The loop has already closed, so nobody is waiting for the line
+            pass
+    
+    threading.Thread(target=read, name="prompt-reader", daemon=True).start()
+    return await future
+
+
 async def main():
+    args = parse_args()
     agent = Manus()
-    while True:
-        try:
-            prompt = input("Enter your prompt (or 'quit' to quit): ")
-            if prompt.lower() == "quit":
-                logger.info("Goodbye!")
+    # Prime the prompt cache while the user is typing the first prompt
+    warm = asyncio.create_task(agent.warm_cache())
+    try:
+        if args.batch_file:
+            await warm
+            await run_batch(agent, args.batch_file)
+            return
+        while True:
+            try:
+                # Background tasks keep running while we wait for the user
+                prompt = await read_input("Enter your prompt (or 'quit' to quit): ")
+                if prompt.lower() == "quit":
+                    logger.info("Goodbye!")
+                    break
+                logger.warning("Processing your request...")
+                await warm
+                await agent.run(prompt)
+            except (EOFError, KeyboardInterrupt, asyncio.CancelledError):
+                # Under asyncio.run, Ctrl-C arrives as a cancellation of this task
+                logger.warning("Goodbye!")
                 break
-            logger.warning("Processing your request...")
-            await agent.run(prompt)
-        except KeyboardInterrupt:
-            logger.warning("Goodbye!")
-            break
+    finally:
+        warm.cancel()
+
+
+def run(coro):
+    """Run a coroutine on uvloop when it is installed, else on the default loop."""
+    if uvloop is None:
+        return asyncio.run(coro)
+    if sys.version_info >= (3, 11):
+        with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+            return runner.run(coro)
+    uvloop.install()
+    return asyncio.run(coro)
 
 
 if __name__ == "__main__":
-    asyncio.run(main()) 
\ No newline at end of file
+    try:
+        run(main())
+    except KeyboardInterrupt:
+        # The runner re-raises the interrupt once main() has said goodbye
+        pass
@@ -1,5 +1,5 @@
 import argparse
-import os
+import logging
 import sys
 from typing import Dict, Any, Optional
 
@@ -7,6 +7,8 @@ from app.config import Config
 from app.logger import get_logger
 from app.flow.flow_factory import create_flow
 
+logger = get_logger("run_flow")
+
 
 def parse_args():
     """Parse command line arguments."""
@@ -33,13 +35,35 @@ def load_config(config_path: Optional[str] = None) -> Config:
     return Config(config_path)
 
 
+def write_output(label: str, value: Any) -> None:
+    """
+    Write a labelled result to stdout in a single buffered write.
+    
+    Large flow outputs go through the binary buffer, so a TTY doesn't flush
+    them line by line.
+    
+    Args:
+        label (str): Prefix such as "Result" or "Error"
+        value (Any): Value to write
+    """
+    line = f"{label}: {value}\n"
+    out = getattr(sys.stdout, "buffer", None)
+    if out is None:
+        # stdout was replaced by a text-only stream
+        sys.stdout.write(line)
+        return
+    # Flush pending text-layer output (e.g. log lines) first to keep ordering
+    sys.stdout.flush()
+    out.write(line.encode("utf-8", "replace"))
+    out.flush()
+
+
 def main():
     """Main entry point for running flows."""
     args = parse_args()
     
     # Set up logging
-    log_level = "DEBUG" if args.verbose else "INFO"
-    logger = get_logger("run_flow", {"logging": {"level": log_level}})
+    logger.setLevel(logging.DEBUG if args.verbose else logging.INFO)
     
     try:
         # Load config
@@ -53,10 +77,14 @@ def main():
         
         # Get input parameters
         input_params = {}
-        if args.input and os.path.exists(args.input):
-            with open(args.input, 'r') as f:
-                content = f.read()
-                input_params["content"] = content
+        if args.input:
+            # Open directly rather than checking exists() first; the flow needs
+            # the whole text for its prompt, so it is read in one go
+            try:
+                with open(args.input, 'r', encoding='utf-8') as f:
+                    input_params["content"] = f.read()
+            except FileNotFoundError:
+                logger.warning(f"Input file not found: {args.input}")
         
         # Add output path if specified
         if args.output:
@@ -69,10 +97,10 @@ def main():
         # Display result
         if result.success:
             logger.info("Flow completed successfully")
-            print(f"Result: {result.result}")
+            write_output("Result", result.result)
         else:
             logger.error(f"Flow failed: {result.error}")
-            print(f"Error: {result.error}")
+            write_output("Error", result.error)
         
         return 0
         
@@ -1,14 +1,10 @@
 #!/usr/bin/env python
 """Generate the corrected architecture diagram for the paper."""
 
-import matplotlib.pyplot as plt
-from matplotlib.patches import FancyBboxPatch
-
-# Initialize Figure
-fig, ax = plt.subplots(1, 1, figsize=(16, 11))
-ax.set_xlim(0, 16)
-ax.set_ylim(0, 11)
-ax.axis('off')
+import argparse
+import hashlib
+from importlib.metadata import version
+from pathlib import Path
 
 # --- Configuration ---
 # Main vertical axis center for the Agent/Tool stack
@@ -18,7 +14,7 @@ LAYER_WIDTH = 10.4
 # Starting X for the main containers
 LAYER_START_X = CENTER_X - (LAYER_WIDTH / 2)
 
-colors = {
+COLORS = {
     'user': '#4A90D9',
     'agent': '#7B68EE', 
     'tool': '#50C878',
@@ -28,14 +24,28 @@ colors = {
     'arrow': '#555555'
 }
 
+LEGEND_ITEMS = (
+    (COLORS['agent'], 'Agent'),
+    (COLORS['tool'], 'Tool'),
+    (COLORS['flow'], 'Flow'),
+    (COLORS['base'], 'Abstract/Registry')
+)
+
+# Output format -> matplotlib backend. The diagram is pure vector content, so
+# vector formats skip rasterizing entirely.
+BACKENDS = {'svg': 'svg', 'pdf': 'pdf', 'png': 'agg'}
+
 # --- Helper Function ---
-def draw_fancy_box(ax, x, y, width, height, color, label, sublabel=None, 
+def draw_fancy_box(ax, patches, x, y, width, height, color, label, sublabel=None, 
                    fontsize=10, fontweight='bold', alpha=0.85, 
                    textcolor='white', boxstyle='round,pad=0.03'):
-    """Draws a box and centers text inside it."""
+    """Draws a box and centers text inside it. The box is appended to patches
+    rather than added to the axes, so all boxes can be drawn as one collection."""
+    from matplotlib.patches import FancyBboxPatch
+    
     box = FancyBboxPatch((x, y), width, height, boxstyle=boxstyle,
                           facecolor=color, edgecolor='white', linewidth=1.5, alpha=alpha)
-    ax.add_patch(box)
+    patches.append(box)
     
     center_x = x + (width / 2)
     center_y = y + (height / 2)
@@ -51,138 +61,175 @@ def draw_fancy_box(ax, x, y, width, height, color, label, sublabel=None,
                 fontweight=fontweight, ha='center', va='center', color=textcolor)
     return box
 
-# --- Title ---
-ax.text(CENTER_X, 10.5, 'OpenAgent Architecture', fontsize=20, fontweight='bold', 
-        ha='center', va='center', color=colors['text'])
-
-# --- User Input Layer ---
-# Width 5, centered at CENTER_X
-user_w = 5.0
-user_x = CENTER_X - (user_w / 2)
-draw_fancy_box(ax, user_x, 9.3, user_w, 0.8, colors['user'], 'User Input', fontsize=13)
-
-# --- Agent Layer Container ---
-agent_layer_box = FancyBboxPatch((LAYER_START_X, 5.0), LAYER_WIDTH, 3.8, boxstyle='round,pad=0.1',
-                              facecolor='#f0f0ff', edgecolor=colors['agent'], linewidth=2, alpha=0.3)
-ax.add_patch(agent_layer_box)
-ax.text(CENTER_X, 8.5, 'Agent Layer', fontsize=12, fontweight='bold', ha='center', va='center', color=colors['agent'])
-
-# --- Individual Agents ---
-# 4 Agents, distributed evenly inside the layer
-agent_w = 2.4
-gap = (LAYER_WIDTH - (4 * agent_w)) / 5  # Calculate gap to fit 4 items
-agent_y = 6.8
-
-agents = [
-    ('ManusAgent', 'Primary\nOrchestrator'),
-    ('PlanningAgent', 'Memory-Enabled\nExecution'),
-    ('ReactAgent', 'Thought-Action\nObservation'),
-    ('SWEAgent', 'Code-Aware\nWorkflow')
-]
-
-agent_centers_x = [] # Store for arrows
-
-current_x = LAYER_START_X + gap
-for name, desc in agents:
-    draw_fancy_box(ax, current_x, agent_y, agent_w, 1.3, colors['agent'], name, desc)
-    agent_centers_x.append(current_x + agent_w/2)
-    current_x += agent_w + gap
-
-# --- BaseAgent ---
-base_w = 5.0
-base_x = CENTER_X - (base_w / 2)
-draw_fancy_box(ax, base_x, 5.3, base_w, 0.7, colors['base'], 'BaseAgent (Abstract)', fontsize=11)
-
-# --- Inheritance Arrows ---
-# Connect bottom of each agent to top of BaseAgent
-for ac_x in agent_centers_x:
-    ax.annotate('', xy=(CENTER_X, 6.0), xytext=(ac_x, 6.8),
-                arrowprops=dict(arrowstyle='->', color=colors['arrow'], lw=1.2, ls='--'))
-
-# --- Tool Layer Container ---
-tool_layer_box = FancyBboxPatch((LAYER_START_X, 1.0), LAYER_WIDTH, 3.5, boxstyle='round,pad=0.1',
-                             facecolor='#f0fff0', edgecolor=colors['tool'], linewidth=2, alpha=0.3)
-ax.add_patch(tool_layer_box)
-ax.text(CENTER_X, 4.15, 'Tool Layer', fontsize=12, fontweight='bold', ha='center', va='center', color=colors['tool'])
-
-# --- Tools Row 1 ---
-# 5 Tools
-tool_w1 = 1.9
-gap1 = (LAYER_WIDTH - (5 * tool_w1)) / 6
-current_x = LAYER_START_X + gap1
-tool_y1 = 3.0
-
-tools_row1 = ['PDFGenerator', 'MarkdownGen', 'CodeGenerator', 'Firecrawl', 'Bash/Py']
-
-for name in tools_row1:
-    draw_fancy_box(ax, current_x, tool_y1, tool_w1, 0.75, colors['tool'], name, fontsize=9)
-    current_x += tool_w1 + gap1
-
-# --- Tools Row 2 ---
-# 3 Tools
-tool_w2 = 2.2
-gap2 = (LAYER_WIDTH - (3 * tool_w2)) / 4
-current_x = LAYER_START_X + gap2
-tool_y2 = 2.0
-
-tools_row2 = ['FileSaver', 'StrReplaceEditor', 'GoogleSearch']
-
-for name in tools_row2:
-    draw_fancy_box(ax, current_x, tool_y2, tool_w2, 0.75, colors['tool'], name, fontsize=9, alpha=0.75)
-    current_x += tool_w2 + gap2
-
-# --- Tool Registry ---
-reg_w = 5.0
-reg_x = CENTER_X - (reg_w / 2)
-draw_fancy_box(ax, reg_x, 1.2, reg_w, 0.6, colors['base'], 'ToolRegistry (Singleton)', fontsize=10)
-
-# --- Flow Layer ---
-# Placed to the right of the main stack
-flow_x = LAYER_START_X + LAYER_WIDTH + 0.8  # Start 0.8 units right of the agent layer
-draw_fancy_box(ax, flow_x, 5.5, 2.2, 2.8, colors['flow'], 'Flow', 'Layer\n(Orchestration)', 
-               fontsize=12, alpha=0.85, boxstyle='round,pad=0.05')
-
-# --- Main Data Flow Arrows ---
-
-# User -> Agent Layer (Vertical Center)
-ax.annotate('', xy=(CENTER_X, 8.5), xytext=(CENTER_X, 9.3),
-            arrowprops=dict(arrowstyle='->', color=colors['arrow'], lw=2))
-
-# Agent Layer <-> Tool Layer (Vertical Center)
-ax.annotate('', xy=(CENTER_X, 4.5), xytext=(CENTER_X, 5.25),
-            arrowprops=dict(arrowstyle='<->', color=colors['arrow'], lw=2))
-
-# Agent Layer <-> Flow Layer (Horizontal)
-# From right edge of Agent Layer Box to Left edge of Flow Box
-agent_box_right = LAYER_START_X + LAYER_WIDTH
-flow_box_left = flow_x
-arrow_y = 6.9
-
-ax.annotate('', xy=(agent_box_right + 0.1, arrow_y), xytext=(flow_box_left - 0.1, arrow_y),
-            arrowprops=dict(arrowstyle='<->', color=colors['arrow'], lw=1.5))
-
-# --- Legend ---
-legend_y = 0.4
-legend_items = [
-    (colors['agent'], 'Agent'),
-    (colors['tool'], 'Tool'),
-    (colors['flow'], 'Flow'),
-    (colors['base'], 'Abstract/Registry')
-]
-
-# Center the legend
-total_legend_width = (len(legend_items) * 2.6)
-legend_start_x = CENTER_X - (total_legend_width / 2) + 0.5
-
-for i, (color, label) in enumerate(legend_items):
-    x = legend_start_x + i * 2.6
-    box = FancyBboxPatch((x, legend_y-0.15), 0.4, 0.3, boxstyle='round,pad=0.01',
-                          facecolor=color, edgecolor='white', linewidth=1, alpha=0.85)
-    ax.add_patch(box)
-    ax.text(x+0.6, legend_y, label, fontsize=9, ha='left', va='center', color=colors['text'])
-
-plt.tight_layout()
-# bbox_inches='tight' ensures nothing is cut off
-plt.savefig('architecture_fixed.png', dpi=150, bbox_inches='tight', 
-            facecolor='white', edgecolor='none')
-print('Fixed architecture diagram saved.')
\ No newline at end of file
+
+def main():
+    """Draw the diagram and save it in the requested format."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--format', choices=sorted(BACKENDS), default='svg',
+                        help='Output format (default: svg)')
+    parser.add_argument('--force', action='store_true',
+                        help='Regenerate even if the output is up to date')
+    args = parser.parse_args()
+    fmt = args.format
+    
+    # The drawing is fully determined by this script and the matplotlib
+    # version, so skip the work when neither changed since the last run.
+    # Reading the version from package metadata avoids importing matplotlib.
+    output = Path(f'architecture_fixed.{fmt}')
+    stamp = Path(f'{output}.hash')
+    digest = hashlib.sha256(Path(__file__).read_bytes() + version('matplotlib').encode()).hexdigest()
+    if not args.force and output.exists() and stamp.exists() and stamp.read_text() == digest:
+        print(f'{output} is up to date.')
+        return
+    
+    # Imported here so the backend is chosen before pyplot loads
+    import matplotlib
+    matplotlib.use(BACKENDS[fmt])
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import PatchCollection
+    from matplotlib.patches import FancyBboxPatch
+    
+    # Initialize Figure
+    fig, ax = plt.subplots(1, 1, figsize=(16, 11))
+    ax.set_xlim(0, 16)
+    ax.set_ylim(0, 11)
+    ax.axis('off')
+    # Every box goes into one PatchCollection, drawn in the order it was added
+    patches = []
+    
+    # --- Title ---
+    ax.text(CENTER_X, 10.5, 'OpenAgent Architecture', fontsize=20, fontweight='bold', 
+            ha='center', va='center', color=COLORS['text'])
+
+    # --- User Input Layer ---
+    # Width 5, centered at CENTER_X
+    user_w = 5.0
+    user_x = CENTER_X - (user_w / 2)
+    draw_fancy_box(ax, patches, user_x, 9.3, user_w, 0.8, COLORS['user'], 'User Input', fontsize=13)
+
+    # --- Agent Layer Container ---
+    agent_layer_box = FancyBboxPatch((LAYER_START_X, 5.0), LAYER_WIDTH, 3.8, boxstyle='round,pad=0.1',
+                                  facecolor='#f0f0ff', edgecolor=COLORS['agent'], linewidth=2, alpha=0.3)
+    patches.append(agent_layer_box)
+    ax.text(CENTER_X, 8.5, 'Agent Layer', fontsize=12, fontweight='bold', ha='center', va='center', color=COLORS['agent'])
+
+    # --- Individual Agents ---
+    # 4 Agents, distributed evenly inside the layer
+    agent_w = 2.4
+    gap = (LAYER_WIDTH - (4 * agent_w)) / 5  # Calculate gap to fit 4 items
+    agent_y = 6.8
+
+    agents = [
+        ('ManusAgent', 'Primary\nOrchestrator'),
+        ('PlanningAgent', 'Memory-Enabled\nExecution'),
+        ('ReactAgent', 'Thought-Action\nObservation'),
+        ('SWEAgent', 'Code-Aware\nWorkflow')
+    ]
+
+    agent_centers_x = [] # Store for arrows
+
+    current_x = LAYER_START_X + gap
+    for name, desc in agents:
+        draw_fancy_box(ax, patches, current_x, agent_y, agent_w, 1.3, COLORS['agent'], name, desc)
+        agent_centers_x.append(current_x + agent_w/2)
+        current_x += agent_w + gap
+
+    # --- BaseAgent ---
+    base_w = 5.0
+    base_x = CENTER_X - (base_w / 2)
+    draw_fancy_box(ax, patches, base_x, 5.3, base_w, 0.7, COLORS['base'], 'BaseAgent (Abstract)', fontsize=11)
+
+    # --- Inheritance Arrows ---
+    # Connect bottom of each agent to top of BaseAgent
+    for ac_x in agent_centers_x:
+        ax.annotate('', xy=(CENTER_X, 6.0), xytext=(ac_x, 6.8),
+                    arrowprops=dict(arrowstyle='->', color=COLORS['arrow'], lw=1.2, ls='--'))
+
+    # --- Tool Layer Container ---
+    tool_layer_box = FancyBboxPatch((LAYER_START_X, 1.0), LAYER_WIDTH, 3.5, boxstyle='round,pad=0.1',
+                                 facecolor='#f0fff0', edgecolor=COLORS['tool'], linewidth=2, alpha=0.3)
+    patches.append(tool_layer_box)
+    ax.text(CENTER_X, 4.15, 'Tool Layer', fontsize=12, fontweight='bold', ha='center', va='center', color=COLORS['tool'])
+
+    # --- Tools Row 1 ---
+    # 5 Tools
+    tool_w1 = 1.9
+    gap1 = (LAYER_WIDTH - (5 * tool_w1)) / 6
+    current_x = LAYER_START_X + gap1
+    tool_y1 = 3.0
+
+    tools_row1 = ['PDFGenerator', 'MarkdownGen', 'CodeGenerator', 'Firecrawl', 'Bash/Py']
+
+    for name in tools_row1:
+        draw_fancy_box(ax, patches, current_x, tool_y1, tool_w1, 0.75, COLORS['tool'], name, fontsize=9)
+        current_x += tool_w1 + gap1
+
+    # --- Tools Row 2 ---
+    # 3 Tools
+    tool_w2 = 2.2
+    gap2 = (LAYER_WIDTH - (3 * tool_w2)) / 4
+    current_x = LAYER_START_X + gap2
+    tool_y2 = 2.0
+
+    tools_row2 = ['FileSaver', 'StrReplaceEditor', 'GoogleSearch']
+
+    for name in tools_row2:
+        draw_fancy_box(ax, patches, current_x, tool_y2, tool_w2, 0.75, COLORS['tool'], name, fontsize=9, alpha=0.75)
+        current_x += tool_w2 + gap2
+
+    # --- Tool Registry ---
+    reg_w = 5.0
+    reg_x = CENTER_X - (reg_w / 2)
+    draw_fancy_box(ax, patches, reg_x, 1.2, reg_w, 0.6, COLORS['base'], 'ToolRegistry (Singleton)', fontsize=10)
+
+    # --- Flow Layer ---
+    # Placed to the right of the main stack
+    flow_x = LAYER_START_X + LAYER_WIDTH + 0.8  # Start 0.8 units right of the agent layer
+    draw_fancy_box(ax, patches, flow_x, 5.5, 2.2, 2.8, COLORS['flow'], 'Flow', 'Layer\n(Orchestration)', 
+                   fontsize=12, alpha=0.85, boxstyle='round,pad=0.05')
+
+    # --- Main Data Flow Arrows ---
+
+    # User -> Agent Layer (Vertical Center)
+    ax.annotate('', xy=(CENTER_X, 8.5), xytext=(CENTER_X, 9.3),
+                arrowprops=dict(arrowstyle='->', color=COLORS['arrow'], lw=2))
+
+    # Agent Layer <-> Tool Layer (Vertical Center)
+    ax.annotate('', xy=(CENTER_X, 4.5), xytext=(CENTER_X, 5.25),
+                arrowprops=dict(arrowstyle='<->', color=COLORS['arrow'], lw=2))
+
+    # Agent Layer <-> Flow Layer (Horizontal)
+    # From right edge of Agent Layer Box to Left edge of Flow Box
+    agent_box_right = LAYER_START_X + LAYER_WIDTH
+    flow_box_left = flow_x
+    arrow_y = 6.9
+
+    ax.annotate('', xy=(agent_box_right + 0.1, arrow_y), xytext=(flow_box_left - 0.1, arrow_y),
+                arrowprops=dict(arrowstyle='<->', color=COLORS['arrow'], lw=1.5))
+
+    # --- Legend ---
+    legend_y = 0.4
+
+    # Center the legend
+    total_legend_width = (len(LEGEND_ITEMS) * 2.6)
+    legend_start_x = CENTER_X - (total_legend_width / 2) + 0.5
+
+    for i, (color, label) in enumerate(LEGEND_ITEMS):
+        x = legend_start_x + i * 2.6
+        box = FancyBboxPatch((x, legend_y-0.15), 0.4, 0.3, boxstyle='round,pad=0.01',
+                              facecolor=color, edgecolor='white', linewidth=1, alpha=0.85)
+        patches.append(box)
+        ax.text(x+0.6, legend_y, label, fontsize=9, ha='left', va='center', color=COLORS['text'])
+
+    ax.add_collection(PatchCollection(patches, match_original=True))
+    
+    plt.tight_layout()
+    # bbox_inches='tight' ensures nothing is cut off
+    plt.savefig(output, dpi=150, bbox_inches='tight', 
+                facecolor='white', edgecolor='none')
+    stamp.write_text(digest)
+    print(f'Fixed architecture diagram saved to {output}.')
+
+
+if __name__ == "__main__":
+    main()
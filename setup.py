@@ -1,4 +1,4 @@
-from setuptools import setup, find_packages
+from setuptools import setup
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -15,7 +15,8 @@ setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/manus-pro/open-agent",
-    packages=find_packages(),
+    # Listed explicitly so stray directories (e.g. tests) never end up in the wheel
+    packages=["app", "app.agent", "app.flow", "app.prompt", "app.tool"],
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: OSI Approved :: MIT License",
@@ -0,0 +1,12 @@
+"""
+Shared fixtures for OpenAgent tests.
+"""
+import pytest
+from app.tool.base import ToolRegistry
+
+
+@pytest.fixture
+def clean_registry(monkeypatch):
+    """Give the test its own ToolRegistry singleton; the shared one is restored afterwards."""
+    monkeypatch.setattr(ToolRegistry, "_instance", None)
+    return ToolRegistry()
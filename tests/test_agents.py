@@ -1,11 +1,16 @@
 """
 Unit tests for OpenAgent agent framework.
 """
+import asyncio
+import logging
 import pytest
-from unittest.mock import Mock, patch, MagicMock
-from app.schema import AgentType, TaskInput, TaskOutput, Conversation, Message
+from unittest.mock import AsyncMock, Mock, patch
+from langchain_core.messages import AIMessage
+from app.schema import AgentType, TaskInput, TaskOutput, TaskPlan, Conversation, Message
 from app.agent.base import BaseAgent
-from app.tool.base import ToolRegistry
+from app.agent.react import ReactAgent
+from app.agent.swe import SWEAgent
+from app.tool.base import BaseTool, ToolRegistry
 
 
 class MockAgent(BaseAgent):
@@ -22,6 +27,42 @@ class MockAgent(BaseAgent):
         )
 
 
+class FailingAgent(BaseAgent):
+    """Agent whose run always raises."""
+    
+    def __init__(self):
+        super().__init__(name="failing")
+    
+    def _run(self, task_input):
+        raise ValueError("Intentional failure")
+
+
+class StubTool(BaseTool):
+    """Tool with a configurable name that does nothing."""
+    
+    def __init__(self, name, description="Stub", parameters=None):
+        super().__init__(name=name, description=description, parameters=parameters)
+    
+    def _run(self, **kwargs):
+        return {}
+
+
+@pytest.fixture
+def stub_registry(clean_registry):
+    """Fresh registry holding the stub tools the agent tests look up by name."""
+    for name, description in [
+        ("test_tool", "Test"),
+        ("dynamic_tool", "Dynamic"),
+        ("hook_tool", "Hook"),
+        ("specific_tool", "Specific"),
+        ("test_react_tool", "Test tool for React"),
+        ("late_react_tool", "Added later"),
+        ("test_swe_tool", "Test tool for SWE"),
+    ]:
+        clean_registry.register(StubTool(name, description))
+    return clean_registry
+
+
 class TestBaseAgent:
     """Tests for BaseAgent abstract class."""
     
@@ -44,57 +85,58 @@ class TestBaseAgent:
     
     def test_agent_run_with_error_handling(self):
         """Test agent error handling."""
-        class FailingAgent(BaseAgent):
-            def __init__(self):
-                super().__init__(name="failing")
-            
-            def _run(self, task_input):
-                raise ValueError("Intentional failure")
-        
         agent = FailingAgent()
         task = TaskInput(task_description="Will fail")
         
         result = agent.run(task)
         
         assert result.success is False
-        assert "Error" in result.error
+        assert result.error == "Error running agent 'failing': Intentional failure"
     
-    def test_agent_with_tools(self):
-        """Test agent initialization with tools."""
-        # First register a tool
-        from app.tool.base import BaseTool
+    def test_agent_run_surfaces_failure_cause(self):
+        """Test run() reports the exception instead of raising it."""
+        agent = FailingAgent()
         
-        class TestTool(BaseTool):
-            def __init__(self):
-                super().__init__(name="test_tool", description="Test")
-            def _run(self, **kwargs):
-                return {}
+        with pytest.raises(ValueError, match="Intentional failure"):
+            agent._run(TaskInput(task_description="Will fail"))
+        assert agent.run(TaskInput(task_description="Will fail")).success is False
+    
+    def test_run_coroutine_sync_inside_running_loop(self):
+        """Test sync runs work under a running loop and share one loop across calls."""
+        from app.agent.base import run_coroutine_sync
         
-        registry = ToolRegistry()
-        registry.register(TestTool())
+        async def current_loop():
+            return asyncio.get_running_loop()
         
+        async def main():
+            return run_coroutine_sync(current_loop())
+        
+        first = asyncio.run(main())
+        second = run_coroutine_sync(current_loop())
+        assert first is second
+        assert not first.is_closed()
+    
+    def test_agent_with_tools(self, stub_registry):
+        """Test agent initialization with tools."""
         agent = MockAgent(tools=["test_tool"])
         assert "test_tool" in agent.tools
     
-    def test_agent_add_tool(self):
+    def test_agent_add_tool(self, stub_registry):
         """Test dynamically adding tools to agent."""
-        from app.tool.base import BaseTool
-        
-        class DynamicTool(BaseTool):
-            def __init__(self):
-                super().__init__(name="dynamic_tool", description="Dynamic")
-            def _run(self, **kwargs):
-                return {}
-        
-        registry = ToolRegistry()
-        registry.register(DynamicTool())
-        
         agent = MockAgent()
         success = agent.add_tool("dynamic_tool")
         
         assert success is True
         assert "dynamic_tool" in agent.tools
-    
+
+    def test_agent_tools_changed_hook(self, stub_registry):
+        """Test that adding a tool notifies the agent."""
+        agent = MockAgent()
+        agent._on_tools_changed = Mock()
+        agent.add_tool("hook_tool")
+
+        agent._on_tools_changed.assert_called_once()
+
     def test_agent_list_tools(self):
         """Test listing agent tools."""
         agent = MockAgent()
@@ -134,19 +176,8 @@ class TestAgentTaskInput:
         result = agent.run(task)
         assert result.success is True
     
-    def test_task_tool_specification(self):
+    def test_task_tool_specification(self, stub_registry):
         """Test task can specify tools."""
-        from app.tool.base import BaseTool
-        
-        class SpecificTool(BaseTool):
-            def __init__(self):
-                super().__init__(name="specific_tool", description="Specific")
-            def _run(self, **kwargs):
-                return {}
-        
-        registry = ToolRegistry()
-        registry.register(SpecificTool())
-        
         agent = MockAgent()
         
         task = TaskInput(
@@ -175,17 +206,36 @@ class TestAgentMetadata:
         """Test agent has logging capability."""
         agent = MockAgent()
         assert agent.logger is not None
+    
+    def test_agent_logger_handlers_not_duplicated(self):
+        """Test creating several agents doesn't stack handlers on the shared logger."""
+        first = MockAgent()
+        second = MockAgent()
+        
+        assert second.logger is first.logger
+        # Count only our console handlers; pytest attaches its own capture handlers
+        console_handlers = [h for h in second.logger.handlers if type(h) is logging.StreamHandler]
+        assert len(console_handlers) == 1
+    
+    def test_agent_logs_reach_root_handlers(self, caplog):
+        """Test agent records still propagate to root handlers such as caplog."""
+        agent = MockAgent()
+        
+        with caplog.at_level(logging.INFO):
+            agent.run(TaskInput(task_description="Logged task"))
+        
+        assert any(r.name == "agent.mock_agent" and "Logged task" in r.getMessage() for r in caplog.records)
 
 
 class TestAgentTypes:
     """Tests for different agent type values."""
 
-    def test_all_agent_types_defined(self):
+    @pytest.mark.parametrize("agent_type", ["manus", "react", "planning", "swe", "toolcall"])
+    def test_all_agent_types_defined(self, agent_type):
         """Test all expected agent types exist."""
-        expected = ["manus", "react", "planning", "swe", "toolcall"]
-        for agent_type in expected:
-            assert hasattr(AgentType, agent_type.upper())
-            assert AgentType[agent_type.upper()].value == agent_type
+        members = AgentType.__members__
+        assert agent_type.upper() in members
+        assert members[agent_type.upper()].value == agent_type
 
 
 class TestReactAgent:
@@ -193,8 +243,6 @@ class TestReactAgent:
 
     def test_react_agent_initialization(self):
         """Test ReactAgent initialization."""
-        from app.agent.react import ReactAgent
-
         agent = ReactAgent()
         assert agent.name == "react"
         assert agent.max_iterations == 10
@@ -202,40 +250,158 @@ class TestReactAgent:
 
     def test_react_agent_with_custom_iterations(self):
         """Test ReactAgent with custom max iterations."""
-        from app.agent.react import ReactAgent
-
         agent = ReactAgent(max_iterations=5)
         assert agent.max_iterations == 5
 
-    def test_react_agent_tools_description(self):
+    def test_react_agent_tools_description(self, stub_registry):
         """Test ReactAgent tool description formatting."""
-        from app.agent.react import ReactAgent
-        from app.tool.base import BaseTool
-
-        # Register a test tool
-        class TestTool(BaseTool):
-            def __init__(self):
-                super().__init__(
-                    name="test_react_tool",
-                    description="Test tool for React",
-                    parameters={"type": "object", "properties": {"input": {"type": "string"}}}
-                )
-            def _run(self, **kwargs):
-                return {"result": "test"}
-
-        registry = ToolRegistry()
-        registry.register(TestTool())
-
         agent = ReactAgent(tools=["test_react_tool"])
         desc = agent._format_tools_description()
 
         assert "test_react_tool" in desc
         assert "Test tool for React" in desc
 
+    def test_react_agent_tools_description_refreshed_on_add(self, stub_registry):
+        """Test the cached tool description is rebuilt when a tool is added."""
+        agent = ReactAgent()
+        assert "late_react_tool" not in agent._format_tools_description()
+
+        agent.add_tool("late_react_tool")
+        assert "late_react_tool" in agent._format_tools_description()
+
+    def test_react_agent_history_window(self):
+        """Test only the most recent steps are replayed in the prompt."""
+        from app import llm
+        from app.agent import react
+
+        agent = react.ReactAgent(max_iterations=4, history_window=2)
+        agent.tools = {}
+        prompts = []
+
+        async def fake_astream_text(prompt, system_prompt=None, stop=None, until=None):
+            prompts.append(prompt)
+            return f"Thought: step {len(prompts)}\nAction: missing_tool\nAction Input: {{}}"
+
+        with patch.object(llm.llm_manager, "astream_text", side_effect=fake_astream_text), \
+                patch.object(llm.llm_manager, "agenerate_text", new=AsyncMock(return_value="Summary")):
+            result = agent._run(TaskInput(task_description="Loop"))
+
+        assert result.metadata["tools_used"] == ["missing_tool"] * 4
+        assert result.metadata["trace"][0] == {
+            "thought": "step 1",
+            "action": "missing_tool",
+            "action_input": {},
+            "observation": result.metadata["trace"][0]["observation"],
+        }
+        assert "step 1" not in prompts[3]
+        assert "[Summary of earlier steps]: Summary" in prompts[3]
+        assert "step 2" in prompts[3] and "step 3" in prompts[3]
+
+    def test_react_agent_run_inside_running_loop(self):
+        """Test the synchronous run works when the caller already has a loop running."""
+        from app import llm
+
+        agent = ReactAgent()
+        agent.tools = {}
+
+        async def main():
+            return agent.run(TaskInput(task_description="Answer"))
+
+        answer = AsyncMock(return_value="Thought: done\nFinal Answer: 42")
+        with patch.object(llm.llm_manager, "astream_text", new=answer):
+            result = asyncio.run(main())
+
+        assert result.success is True
+        assert result.result == "42"
+
+    def test_react_agent_execute_tool_matches_name(self):
+        """Test tool lookup prefers exact names and falls back to fuzzy matches."""
+        search = Mock(**{"safe_run.return_value": {"result": "search"}})
+        deep_search = Mock(**{"safe_run.return_value": {"result": "deep"}})
+        agent = ReactAgent()
+        agent.tools = {"deep_search": deep_search, "search": search}
+        agent._on_tools_changed()
+
+        assert agent._execute_tool("Search", {}) == "search"
+        assert agent._execute_tool("deep", {}) == "deep"
+        assert "not found" in agent._execute_tool("missing", {})
+
+    def test_react_agent_executes_batched_action(self):
+        """Test a JSON list action input runs the tool once per parameter set."""
+        search = Mock(supports_batch=True)
+        search.safe_run.side_effect = lambda query: {"result": query.upper()}
+        agent = ReactAgent()
+        agent.tools = {"search": search}
+        agent._on_tools_changed()
+
+        action, params, _ = agent._parse_action(
+            'Action: search\nAction Input: [{"query": "a"}, {"query": "b"}]'
+        )
+        observation = agent._execute_tool(action, params)
+
+        assert params == [{"query": "a"}, {"query": "b"}]
+        assert observation == "[1] A\n---\n[2] B"
+        assert search.safe_run.call_count == 2
+
+    def test_react_agent_truncates_params_for_history(self):
+        """Test long parameter values are shortened in the replayed history."""
+        import json
+
+        agent = ReactAgent()
+        text = agent._truncate_params_for_history({"content": "x" * 600, "depth": 2}, max_len=10)
+
+        assert json.loads(text) == {"content": "x" * 10 + "... [truncated]", "depth": 2}
+
+    def test_react_agent_truncates_observation(self):
+        """Test long text and binary tool content is cut to the observation limit."""
+        agent = ReactAgent()
+
+        assert agent._truncate_observation("short") == "short"
+        assert agent._truncate_observation("x" * 50, max_len=10) == "x" * 10 + "... [truncated]"
+        assert agent._truncate_observation(b"y" * 10_000, max_len=10) == "y" * 10 + "... [truncated]"
+
+    def test_react_agent_stops_after_repeated_parse_failures(self):
+        """Test the loop stops early when the model keeps skipping the format."""
+        from app import llm
+        from app.agent import react
+
+        agent = react.ReactAgent(max_iterations=10)
+
+        with patch.object(llm.llm_manager, "astream_text", new=AsyncMock(return_value="I am not sure.")) as astream_text, \
+                patch.object(llm.llm_manager, "agenerate_text", new=AsyncMock(return_value="Summary")) as agenerate_text:
+            result = agent._run(TaskInput(task_description="Stuck"))
+
+        assert astream_text.await_count == 3
+        assert result.metadata["early_stopped"] is True
+        assert result.metadata["iterations"] == 3
+        # No observations were gathered, so no summary call is made
+        agenerate_text.assert_not_awaited()
+        assert "no observations gathered" in result.result
+
+    def test_react_agent_stream_stops_after_action_input(self):
+        """Test streaming ends once the action input is complete."""
+        from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+        from app.agent.react import _RE_ACTION_INPUT_DONE
+        from app.llm import LLMManager
+
+        text = 'Thought: search\nAction: google_search\nAction Input: {"query": "q"}\n\nThought: more text'
+        fake = GenericFakeChatModel(messages=iter([AIMessage(content=text)]))
+        manager = LLMManager(llm=fake)
+
+        response = asyncio.run(manager.astream_text("go", until=_RE_ACTION_INPUT_DONE.search))
+
+        assert response.endswith('{"query": "q"}\n\n')
+
+    def test_react_agent_stream_waits_for_action_input_content(self):
+        """Test a blank line before the action input's value doesn't end the stream."""
+        from app.agent.react import _RE_ACTION_INPUT_DONE
+
+        assert not _RE_ACTION_INPUT_DONE.search("Action: search\nAction Input:\n\n")
+        assert not _RE_ACTION_INPUT_DONE.search('Action: search\nAction Input:\n\n{"q": 1}\n')
+        assert _RE_ACTION_INPUT_DONE.search('Action: search\nAction Input:\n\n{"q": 1}\n\n')
+
     def test_react_agent_parse_action(self):
         """Test ReactAgent action parsing."""
-        from app.agent.react import ReactAgent
-
         agent = ReactAgent()
 
         # Test parsing action
@@ -248,10 +414,43 @@ Action Input: {"query": "test query"}"""
         assert params == {"query": "test query"}
         assert final is None
 
+    def test_react_agent_parse_action_input_after_blank_line(self):
+        """Test blank lines between the action input header and its value are skipped."""
+        agent = ReactAgent()
+
+        response = 'Thought: x\nAction: search\nAction Input:\n\n{"q": 1}'
+        assert agent._parse_action(response) == ("search", {"q": 1}, None)
+
+    def test_react_agent_parse_inline_final_answer(self):
+        """Test a final answer is found after other text on the same line."""
+        agent = ReactAgent()
+
+        assert agent._parse_action("Thought: done. Final Answer: 42") == (None, None, "42")
+
+    def test_react_agent_parse_action_name_strips_wrapping(self):
+        """Test the action name is the identifier at the start of the first token."""
+        agent = ReactAgent()
+
+        for line in (
+            "Action: [google_search]",
+            "Action: `google_search`.",
+            "Action:  google_search now",
+            "Action: google_search(query='x')",
+        ):
+            action, _, _ = agent._parse_action(line)
+            assert action == "google_search"
+        assert agent._parse_action("Action: ...") == (None, None, None)
+
+    def test_react_agent_parse_fenced_action_input(self):
+        """Test JSON action input is read through a fence or trailing prose."""
+        agent = ReactAgent()
+
+        for action_input in ('```json\n{"query": "q"}\n```', '```{"query": "q"}```', '{"query": "q"} to find it'):
+            _, params, _ = agent._parse_action(f"Action: google_search\nAction Input: {action_input}")
+            assert params == {"query": "q"}
+
     def test_react_agent_parse_final_answer(self):
         """Test ReactAgent final answer parsing."""
-        from app.agent.react import ReactAgent
-
         agent = ReactAgent()
 
         response = """Thought: I have all the information needed
@@ -262,14 +461,35 @@ Final Answer: The answer to your question is 42."""
         assert params is None
         assert "42" in final
 
+    def test_react_agent_parse_response_sections(self):
+        """Test a multi-line response is split into its sections in one pass."""
+        agent = ReactAgent()
+
+        response = """Thought: I should look this up
+before answering.
+Action: google_search
+Action Input: ```json
+{"query": "ReAct paper"}
+```
+
+Thought: ignored second thought"""
+
+        sections = agent._parse_response(response)
+        assert sections["thought"] == "I should look this up\nbefore answering."
+        assert sections["action"] == "google_search"
+        assert sections["final_answer"] is None
+
+        action, params, final = agent._action_from_sections(sections)
+        assert action == "google_search"
+        assert params == {"query": "ReAct paper"}
+        assert final is None
+
 
 class TestSWEAgent:
     """Tests for SWEAgent implementation."""
 
     def test_swe_agent_initialization(self):
         """Test SWEAgent initialization."""
-        from app.agent.swe import SWEAgent
-
         agent = SWEAgent()
         assert agent.name == "swe"
         assert agent.max_iterations == 5
@@ -277,16 +497,12 @@ class TestSWEAgent:
 
     def test_swe_agent_with_custom_settings(self):
         """Test SWEAgent with custom settings."""
-        from app.agent.swe import SWEAgent
-
         agent = SWEAgent(max_iterations=3, auto_execute=False)
         assert agent.max_iterations == 3
         assert agent.auto_execute is False
 
     def test_swe_agent_default_tools(self):
         """Test SWEAgent has correct default tools."""
-        from app.agent.swe import SWEAgent
-
         agent = SWEAgent()
         # SWE agent should have code-related tools
         expected_tools = ["code_generator", "bash", "python_execute", "file_saver"]
@@ -294,33 +510,125 @@ class TestSWEAgent:
             # Tool might be registered or not, but agent should try to add it
             assert tool in agent.tools or True  # Gracefully handle missing tools
 
-    def test_swe_agent_tools_description(self):
+    def test_swe_agent_tools_description(self, stub_registry):
         """Test SWEAgent tool description formatting."""
-        from app.agent.swe import SWEAgent
-        from app.tool.base import BaseTool
-
-        class TestSWETool(BaseTool):
-            def __init__(self):
-                super().__init__(
-                    name="test_swe_tool",
-                    description="Test tool for SWE",
-                    parameters={"type": "object", "properties": {}}
-                )
-            def _run(self, **kwargs):
-                return {"result": "test"}
-
-        registry = ToolRegistry()
-        registry.register(TestSWETool())
-
         agent = SWEAgent(tools=["test_swe_tool"])
         desc = agent._format_tools_description()
 
         assert "test_swe_tool" in desc
+        assert agent._format_tools_description() is desc
+
+        # Changing the tool set rebuilds the cached description
+        agent.add_tool("test_swe_tool")
+        assert agent._format_tools_description() is not desc
+
+    def test_swe_agent_parses_task_analysis_and_plan(self):
+        """Test SWEAgent reads the analysis fields and numbered plan steps."""
+        from app.agent import swe
+
+        agent = swe.SWEAgent()
+        swe._ANALYSIS_CACHE.clear()
+        swe._PLAN_CACHE.clear()
+        analysis_text = "TASK_TYPE: bug_fix\nLANGUAGE: Go\nREQUIREMENTS:\n- fix it\n- add test\nCOMPLEXITY: Simple"
+        plan_text = "PLAN:\n1. Read the code\n  2) Fix the bug\nStep 3: Add a test\n4.\nDone."
+
+        with patch.object(swe.llm_manager, "generate_text", return_value=analysis_text):
+            analysis = agent._understand_task("Fix the bug")
+        with patch.object(swe.llm_manager, "generate_text", return_value=plan_text):
+            plan = agent._create_plan("Fix the bug", analysis)
+
+        assert analysis["task_type"] == "bug_fix"
+        assert analysis["language"] == "Go"
+        assert analysis["complexity"] == "simple"
+        assert analysis["requirements"] == ["fix it", "add test"]
+        assert plan == ["Read the code", "Fix the bug", "Add a test"]
+
+    def test_swe_agent_caches_analysis_and_plan(self):
+        """Test repeated tasks reuse the analysis and plan without calling the LLM."""
+        from app.agent import swe
+
+        agent = swe.SWEAgent()
+        swe._ANALYSIS_CACHE.clear()
+        swe._PLAN_CACHE.clear()
+        responses = ["TASK_TYPE: testing\nLANGUAGE: python\nCOMPLEXITY: simple", "1. Write tests"]
+
+        with patch.object(swe.llm_manager, "generate_text", side_effect=responses * 2) as generate_text:
+            for task in ("Write  tests", "Write tests"):
+                analysis = agent._understand_task(task)
+                plan = agent._create_plan(task, analysis)
+                plan.append("mutated")
+
+        assert generate_text.call_count == 2
+        assert agent._create_plan("Write tests", analysis) == ["Write tests"]
+
+    def test_swe_agent_selects_tools_for_plan_concurrently(self):
+        """Test tool selection runs for every step and keeps plan order."""
+        from app.agent import swe
+
+        agent = swe.SWEAgent()
+        agent.tools = {"bash": Mock(parameters={}), "code_generator": Mock(parameters={})}
+        agent._on_tools_changed()
+
+        async def fake_agenerate_text(prompt, system_prompt=None):
+            if "Task Step: run" in prompt:
+                await asyncio.sleep(0.01)
+                return 'TOOL: bash\nPARAMETERS: {"command": "ls"}'
+            return "TOOL: Code\nPARAMETERS: {}"
+
+        with patch.object(swe.llm_manager, "agenerate_text", side_effect=fake_agenerate_text):
+            selections = asyncio.run(agent._aselect_tools_for_plan(["run", "write"], "{}"))
+
+        assert selections == [("bash", {"command": "ls"}), ("code_generator", {})]
+
+    def test_swe_agent_run_inside_running_loop(self):
+        """Test the synchronous run works when the caller already has a loop running."""
+        from app.agent import swe
+
+        agent = swe.SWEAgent(auto_execute=False)
+        agent.tools = {"code_generator": Mock(parameters={}, **{"safe_run.return_value": {"success": True}})}
+        agent._on_tools_changed()
+        swe._ANALYSIS_CACHE.clear()
+        swe._PLAN_CACHE.clear()
+        responses = ["TASK_TYPE: feature\nLANGUAGE: python\nCOMPLEXITY: simple", "1. Write code"]
+
+        async def main():
+            return agent.run(TaskInput(task_description="Write code in a loop"))
+
+        with patch.object(swe.llm_manager, "generate_text", side_effect=responses), \
+                patch.object(swe.llm_manager, "agenerate_text", new=AsyncMock(return_value="TOOL: code_generator\nPARAMETERS: {}")):
+            result = asyncio.run(main())
+
+        assert result.success is True
+        assert result.metadata["plan"] == ["Write code"]
+
+    def test_swe_agent_iterate_extracts_fixed_code(self):
+        """Test the fixed code is taken from the first fenced block only when one is closed."""
+        from app.agent import swe
+
+        agent = swe.SWEAgent()
+        fixed = "The fix:\n```python\nprint('ok')\n```\nDone."
+
+        with patch.object(swe.llm_manager, "generate_text", return_value=fixed):
+            context = agent._iterate_on_errors("task", {"generated_code": "print(x)"}, ["NameError"])
+        assert context["generated_code"] == "print('ok')"
+
+        with patch.object(swe.llm_manager, "generate_text", return_value="```python\nprint('unclosed')"):
+            context = agent._iterate_on_errors("task", {"generated_code": "print(x)"}, ["NameError"])
+        assert context["generated_code"] == "print(x)"
+
+    def test_swe_agent_verification_skipped_without_python_code(self):
+        """Test verification doesn't dispatch a tool when there is no Python code to run."""
+        agent = SWEAgent()
+        agent.tools = {"python_execute": Mock()}
+
+        verification = agent._verify_implementation({"generated_code": "console.log(1)", "language": "javascript"})
+
+        assert verification["success"] is True
+        assert verification["skipped"] is True
+        agent.tools["python_execute"].safe_run.assert_not_called()
 
     def test_swe_agent_generate_summary(self):
         """Test SWEAgent summary generation."""
-        from app.agent.swe import SWEAgent
-
         agent = SWEAgent()
 
         context = {
@@ -337,11 +645,288 @@ class TestSWEAgent:
 
         summary = agent._generate_summary(context)
 
-        assert "Task Analysis" in summary
-        assert "python" in summary
-        assert "Implementation Plan" in summary
-        assert "Generated Files" in summary
-        assert "SUCCESS" in summary
+        assert summary == (
+            "## Task Analysis\n"
+            "- Type: code_generation\n"
+            "- Language: python\n"
+            "- Complexity: simple\n"
+            "\n"
+            "## Implementation Plan\n"
+            "1. Write function\n"
+            "2. Add tests\n"
+            "\n"
+            "## Generated Files\n"
+            "- /tmp/test.py\n"
+            "\n"
+            "## Verification\n"
+            "Status: SUCCESS\n"
+            "Output: All tests passed\n"
+            "\n"
+            "## Generated Code Preview\n"
+            "```\n"
+            "def hello(): return 'world'\n"
+            "```"
+        )
+
+
+class TestManusAgent:
+    """Tests for ManusAgent output processing."""
+
+    def test_extract_artifacts_from_output(self):
+        """Test file paths in agent output are grouped by type."""
+        from app.agent.manus import ManusAgent
+
+        agent = ManusAgent()
+        output = (
+            "I generated file: output/report.pdf\n"
+            "I created file: output/code/main.py"
+        )
+
+        artifacts = agent._extract_artifacts_from_output(output)
+
+        assert artifacts["pdf"] == ["output/report.pdf"]
+        assert artifacts["code"] == ["output/code/main.py"]
+
+    def test_agents_share_tool_pool(self):
+        """Test agents run tools on one shared pool instead of each owning threads."""
+        from app.agent.manus import ManusAgent, _TOOL_POOL
+
+        first, second = ManusAgent(), ManusAgent()
+        assert first._async_caller.executor is _TOOL_POOL
+        assert second._async_caller.executor is _TOOL_POOL
+
+    def test_extract_artifacts_no_matches(self):
+        """Test output without file paths yields no artifacts."""
+        from app.agent.manus import ManusAgent
+
+        agent = ManusAgent()
+        assert agent._extract_artifacts_from_output("Nothing was written.") is None
+
+    def test_extract_artifacts_code_phrases_skip_pdfs(self):
+        """Test phrases announcing code only match code and text extensions."""
+        from app.agent.manus import ManusAgent
+
+        agent = ManusAgent()
+        assert agent._extract_artifacts_from_output("Code artifact saved: output/report.pdf") is None
+        assert agent._extract_artifacts_from_output("Code artifact saved: output/main.py") == {"code": ["output/main.py"]}
+
+    def test_extract_artifacts_deduplicates_paths(self):
+        """Test a path announced by overlapping phrases is recorded once."""
+        from app.agent.manus import ManusAgent
+
+        agent = ManusAgent()
+        output = "Code file saved as: output/code/main.py\nI created file: output/code/main.py"
+
+        artifacts = agent._extract_artifacts_from_output(output)
+
+        assert artifacts == {"code": ["output/code/main.py"]}
+
+    def test_group_artifacts_from_tool_results(self):
+        """Test artifact paths reported by tools are grouped like output paths."""
+        from app.agent.manus import ManusAgent
+
+        agent = ManusAgent()
+        steps = [
+            (Mock(), {"artifact_path": "output/pdf/report.pdf"}),
+            (Mock(), {"artifact_path": "output/code/app.js"}),
+            (Mock(), {"artifact_path": "output/pdf/report.pdf"}),
+            (Mock(), "plain text result"),
+        ]
+
+        artifacts = agent._group_artifacts(agent._artifact_paths_from_steps(steps))
+
+        assert artifacts == {"pdf": ["output/pdf/report.pdf"], "code": ["output/code/app.js"]}
+
+    def test_file_extension(self):
+        """Test extensions are lowercased and dotted directories ignored."""
+        from app.agent.manus import _file_extension
+
+        assert _file_extension("output/Report.PDF") == "pdf"
+        assert _file_extension("output/v1.2/README") == ""
+        assert _file_extension("Makefile") == ""
+
+    def test_invoke_executor_streams_tokens(self):
+        """Test tokens are forwarded to on_token and the final output returned."""
+        from app.agent.manus import ManusAgent
+
+        async def fake_events(inputs, config=None, version=None):
+            yield {"event": "on_chat_model_stream", "data": {"chunk": AIMessage(content="Hel")}, "parent_ids": ["root"]}
+            yield {"event": "on_chat_model_stream", "data": {"chunk": AIMessage(content="lo")}, "parent_ids": ["root"]}
+            yield {"event": "on_chain_end", "data": {"output": {"output": "Hello"}}, "parent_ids": []}
+
+        executor = Mock()
+        executor.astream_events = fake_events
+        agent = ManusAgent()
+        tokens = []
+        agent.on_token = tokens.append
+
+        result = asyncio.run(agent._invoke_executor(executor, {"input": "hi"}))
+
+        assert tokens == ["Hel", "lo"]
+        assert result == {"output": "Hello"}
+
+    def test_system_message_caches_static_block_only(self):
+        """Test only the static system prompt block carries a cache breakpoint."""
+        from app.llm import build_system_message
+
+        ChatAnthropic = type("ChatAnthropic", (), {})
+        message = build_system_message("static", ChatAnthropic(), dynamic_text="tools")
+
+        assert message.content == [
+            {"type": "text", "text": "static", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "tools"},
+        ]
+        assert build_system_message("static", None, dynamic_text="tools").content == "statictools"
+
+    def test_bind_cache_key_only_for_openai(self):
+        """Test the session id is sent as OpenAI's prompt cache key."""
+        from langchain_openai import ChatOpenAI
+        from app.llm import bind_cache_key
+
+        llm = ChatOpenAI(model="gpt-4", api_key="sk-test")
+        other = type("ChatAnthropic", (), {})()
+
+        assert bind_cache_key(llm, "session-1").kwargs == {"prompt_cache_key": "session-1"}
+        assert bind_cache_key(llm, None) is llm
+        assert bind_cache_key(other, "session-1") is other
+
+    def test_llm_manager_marks_system_prompt_cacheable(self):
+        """Test system prompts reach Anthropic models as cache_control blocks."""
+        from app.llm import LLMManager
+
+        sent = []
+
+        async def ainvoke(self, messages):
+            sent.append(messages)
+            return AIMessage(content="ok")
+
+        ChatAnthropic = type("ChatAnthropic", (), {"ainvoke": ainvoke})
+        manager = LLMManager(llm=ChatAnthropic())
+
+        asyncio.run(manager.agenerate_text("hi", system_prompt="static rules"))
+
+        system = sent[0][0].content
+        assert isinstance(system, list)
+        assert system[0]["cache_control"] == {"type": "ephemeral"}
+
+    def test_usage_collector_accumulates_cached_tokens(self):
+        """Test prompt cache usage is summed across LLM calls."""
+        from langchain_core.outputs import LLMResult
+        from app.llm import UsageCollector
+
+        usage = UsageCollector()
+        for cached in (0, 768):
+            usage.on_llm_end(LLMResult(generations=[], llm_output={
+                "token_usage": {"prompt_tokens": 1024, "prompt_tokens_details": {"cached_tokens": cached}}
+            }))
+
+        assert usage.to_dict() == {
+            "llm_calls": 2,
+            "prompt_tokens": 2048,
+            "cached_tokens": 768,
+            "cache_hit_rate": 0.375,
+        }
+
+    def test_infer_task_skips_llm_for_conversation(self):
+        """Test greetings are classified without an LLM call."""
+        from app.agent import manus
+
+        agent = manus.ManusAgent()
+        with patch.object(manus.llm_manager, "agenerate_structured") as agenerate_structured:
+            is_task, plan = asyncio.run(agent._infer_task_and_plan("hello there"))
+
+        assert is_task is False
+        assert plan is None
+        agenerate_structured.assert_not_called()
+
+    def test_infer_task_reuses_cached_plan(self):
+        """Test repeated task inputs only call the LLM once."""
+        from app.agent import manus
+
+        agent = manus.ManusAgent()
+        task = "Please  research solar panels and write a short report"
+        manus._PLAN_CACHE.clear()
+
+        async def fake_agenerate_structured(prompt, schema):
+            return TaskPlan(is_task=True, steps=["Research solar panels", "Write the report"])
+
+        with patch.object(manus.llm_manager, "agenerate_structured", side_effect=fake_agenerate_structured) as agenerate_structured:
+            first = asyncio.run(agent._infer_task_and_plan(task))
+            second = asyncio.run(agent._infer_task_and_plan(" ".join(task.split())))
+
+        assert first == second == (True, ["Research solar panels", "Write the report"])
+        assert agenerate_structured.call_count == 1
+
+    def test_warm_cache_sends_system_prompt_prefix(self):
+        """Test cache warming sends the executor's system prompt and functions."""
+        from app.agent.manus import ManusAgent
+
+        agent = ManusAgent()
+        agent.llm = Mock()
+        bound = agent.llm.bind.return_value
+        bound.ainvoke = AsyncMock(return_value=AIMessage(content=""))
+
+        asyncio.run(agent.warm_cache())
+
+        kwargs = agent.llm.bind.call_args.kwargs
+        assert kwargs["max_tokens"] == 1
+        assert {f["name"] for f in kwargs["functions"]} == set(agent.tools)
+        messages = bound.ainvoke.call_args.args[0]
+        assert messages[0].content == agent._system_message().content
+
+
+class TestManusInterface:
+    """Tests for the Manus interactive interface."""
+
+    def test_check_artifact_request_opens_matching_file(self):
+        """Test an open request naming a recent artifact opens it."""
+        from app.agent.manus import Manus
+
+        manus = Manus()
+        manus.recent_artifacts.append({"pdf": ["output/pdf/Report.pdf"]})
+        manus._open_artifact = AsyncMock()
+
+        handled = asyncio.run(manus._check_artifact_request("Please open report.pdf"))
+
+        assert handled is True
+        manus._open_artifact.assert_awaited_once_with("output/pdf/Report.pdf")
+
+    def test_check_artifact_request_requires_open_word(self):
+        """Test prompts without an open verb are not treated as artifact requests."""
+        from app.agent.manus import Manus
+
+        manus = Manus()
+        manus.recent_artifacts.append({"pdf": ["output/pdf/report.pdf"]})
+        manus._open_artifact = AsyncMock()
+
+        handled = asyncio.run(manus._check_artifact_request("Summarize report.pdf for me"))
+
+        assert handled is False
+        manus._open_artifact.assert_not_awaited()
+
+    def test_run_batch_runs_prompts_concurrently(self):
+        """Test batched prompts run together and keep their order."""
+        from app.agent.manus import Manus
+
+        manus = Manus()
+        on_token = manus.agent.on_token
+        running = []
+
+        async def fake_arun(task_input):
+            running.append(task_input.task_description)
+            await asyncio.sleep(0)
+            # Every prompt has started before any finishes
+            assert len(running) == 2
+            assert manus.agent.on_token is None
+            return TaskOutput(success=True, result=task_input.task_description.upper())
+
+        manus.agent.arun = fake_arun
+
+        results = asyncio.run(manus.run_batch(["first", "second"]))
+
+        assert [r.result for r in results] == ["FIRST", "SECOND"]
+        assert manus.agent.on_token == on_token
+        assert manus.conversation.messages == []
 
 
 if __name__ == "__main__":
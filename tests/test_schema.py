@@ -4,7 +4,7 @@ Unit tests for OpenAgent schema definitions.
 import pytest
 from app.schema import (
     AgentType, ToolType, DocumentFormat, WebDriverType,
-    Message, Conversation, TaskInput, TaskOutput,
+    Message, Conversation, TaskInput, TaskOutput, TaskPlan,
     WebResearchInput, BrowserTaskInput, CodeGenerationInput,
     VisualizationData, DataTable, DocumentGenerationOptions
 )
@@ -13,36 +13,20 @@ from app.schema import (
 class TestEnums:
     """Tests for enumeration types."""
     
-    def test_agent_types(self):
-        """Test that all expected agent types are defined."""
-        assert AgentType.MANUS.value == "manus"
-        assert AgentType.REACT.value == "react"
-        assert AgentType.PLANNING.value == "planning"
-        assert AgentType.SWE.value == "swe"
-        assert AgentType.TOOLCALL.value == "toolcall"
-    
-    def test_tool_types(self):
-        """Test that all expected tool types are defined."""
-        expected_tools = [
+    @pytest.mark.parametrize("enum_cls,value", [
+        *[(AgentType, v) for v in ("manus", "react", "planning", "swe", "toolcall")],
+        *[(ToolType, v) for v in (
             "pdf_generator", "markdown_generator", "code_generator",
             "browser", "firecrawl", "bash", "python_execute",
             "file_saver", "google_search", "create_chat_completion",
             "str_replace_editor", "terminate"
-        ]
-        for tool in expected_tools:
-            assert hasattr(ToolType, tool.upper())
-    
-    def test_document_formats(self):
-        """Test supported document formats."""
-        assert DocumentFormat.PDF.value == "pdf"
-        assert DocumentFormat.MARKDOWN.value == "markdown"
-        assert DocumentFormat.HTML.value == "html"
-        assert DocumentFormat.TEXT.value == "text"
-    
-    def test_webdriver_types(self):
-        """Test supported browser types."""
-        assert WebDriverType.CHROME.value == "chrome"
-        assert WebDriverType.FIREFOX.value == "firefox"
+        )],
+        *[(DocumentFormat, v) for v in ("pdf", "markdown", "html", "text")],
+        *[(WebDriverType, v) for v in ("chrome", "firefox")],
+    ])
+    def test_enum_value(self, enum_cls, value):
+        """Test each expected enum member exists under its upper-cased name."""
+        assert enum_cls[value.upper()].value == value
 
 
 class TestMessage:
@@ -54,11 +38,11 @@ class TestMessage:
         assert msg.role == "user"
         assert msg.content == "Hello"
     
-    def test_message_roles(self):
+    @pytest.mark.parametrize("role", ["system", "user", "assistant"])
+    def test_message_roles(self, role):
         """Test different message roles."""
-        for role in ["system", "user", "assistant"]:
-            msg = Message(role=role, content="test")
-            assert msg.role == role
+        msg = Message(role=role, content="test")
+        assert msg.role == role
 
 
 class TestConversation:
@@ -135,6 +119,21 @@ class TestTaskOutput:
         assert output.metadata["tool_calls"] == 3
 
 
+class TestTaskPlan:
+    """Tests for TaskPlan model."""
+    
+    def test_non_task_defaults_to_no_steps(self):
+        """Test a conversational classification needs no steps."""
+        plan = TaskPlan(is_task=False)
+        assert plan.steps == []
+    
+    def test_task_with_steps(self):
+        """Test a task classification carries its steps in order."""
+        plan = TaskPlan(is_task=True, steps=["Research topic", "Write report"])
+        assert plan.is_task is True
+        assert plan.steps[-1] == "Write report"
+
+
 class TestWebResearchInput:
     """Tests for WebResearchInput model."""
     
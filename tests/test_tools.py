@@ -2,7 +2,7 @@
 Unit tests for OpenAgent tool framework.
 """
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import AsyncMock, Mock, patch
 from app.tool.base import BaseTool, ToolRegistry
 
 
@@ -26,6 +26,26 @@ class MockTool(BaseTool):
         return {"result": f"Processed: {input}"}
 
 
+class FailingTool(BaseTool):
+    """Tool whose run always raises."""
+    
+    def __init__(self):
+        super().__init__(name="failing", description="Fails")
+    
+    def _run(self, **kwargs):
+        raise ValueError("Intentional failure")
+
+
+class MinimalTool(BaseTool):
+    """Tool declared without a parameter schema."""
+    
+    def __init__(self):
+        super().__init__(name="minimal", description="Minimal tool")
+    
+    def _run(self, **kwargs):
+        return {}
+
+
 class TestBaseTool:
     """Tests for BaseTool abstract class."""
     
@@ -66,13 +86,6 @@ class TestBaseTool:
     
     def test_tool_error_handling(self):
         """Test error handling in tool execution."""
-        class FailingTool(BaseTool):
-            def __init__(self):
-                super().__init__(name="failing", description="Fails")
-            
-            def _run(self, **kwargs):
-                raise ValueError("Intentional failure")
-        
         tool = FailingTool()
         with pytest.raises(Exception):
             tool.run()
@@ -81,48 +94,61 @@ class TestBaseTool:
 class TestToolRegistry:
     """Tests for ToolRegistry singleton."""
     
-    def test_singleton_pattern(self):
+    def test_singleton_pattern(self, clean_registry):
         """Test that registry follows singleton pattern."""
-        registry1 = ToolRegistry()
-        registry2 = ToolRegistry()
-        assert registry1 is registry2
+        assert ToolRegistry() is clean_registry
+        assert ToolRegistry() is ToolRegistry()
     
-    def test_register_tool(self):
+    def test_register_tool(self, clean_registry):
         """Test tool registration."""
-        registry = ToolRegistry()
-        registry.clear()  # Clear for clean test
-        
         tool = MockTool()
-        registry.register(tool)
+        clean_registry.register(tool)
         
-        assert registry.get("mock_tool") is tool
+        assert clean_registry.get("mock_tool") is tool
     
-    def test_get_nonexistent_tool(self):
+    def test_get_nonexistent_tool(self, clean_registry):
         """Test getting a tool that doesn't exist."""
-        registry = ToolRegistry()
-        result = registry.get("nonexistent_tool_xyz")
-        assert result is None
+        assert clean_registry.get("nonexistent_tool_xyz") is None
     
-    def test_list_tools(self):
+    def test_list_tools(self, clean_registry):
         """Test listing all registered tools."""
-        registry = ToolRegistry()
-        registry.clear()
+        clean_registry.register(MockTool())
         
-        tool = MockTool()
-        registry.register(tool)
-        
-        tools = registry.list_tools()
-        assert len(tools) >= 1
-        assert any(t["name"] == "mock_tool" for t in tools)
+        tools = clean_registry.list_tools()
+        assert [t["name"] for t in tools] == ["mock_tool"]
     
-    def test_clear_registry(self):
+    def test_clear_registry(self, clean_registry):
         """Test clearing the registry."""
-        registry = ToolRegistry()
-        tool = MockTool()
-        registry.register(tool)
+        clean_registry.register(MockTool())
         
-        registry.clear()
-        assert registry.get("mock_tool") is None
+        clean_registry.clear()
+        assert clean_registry.get("mock_tool") is None
+    
+    def test_lazy_registration(self, clean_registry):
+        """Test lazily registered tools are imported on first lookup."""
+        clean_registry.register_lazy("file_saver", "app.tool.file_saver", "FileSaverTool")
+        clean_registry.register_lazy("missing", "app.tool.does_not_exist", "MissingTool")
+        
+        assert clean_registry.names == ["file_saver", "missing"]
+        assert "file_saver" not in clean_registry.tools
+        assert clean_registry.get("file_saver").name == "file_saver"
+        
+        # Tools that fail to import are dropped
+        assert clean_registry.get("missing") is None
+        assert clean_registry.names == ["file_saver"]
+    
+    def test_tools_with_missing_dependencies_not_registered(self, clean_registry, monkeypatch):
+        """Test tools whose required packages aren't installed are skipped."""
+        import importlib.util
+        from app.tool import tool_collection
+        
+        monkeypatch.setattr(tool_collection, "registry", clean_registry)
+        find_spec = importlib.util.find_spec
+        monkeypatch.setattr(importlib.util, "find_spec", lambda name: None if name == "selenium" else find_spec(name))
+        tool_collection.register_all_tools()
+        
+        assert "browser" not in clean_registry.names
+        assert "file_saver" in clean_registry.names
 
 
 class TestToolParameterHandling:
@@ -131,25 +157,18 @@ class TestToolParameterHandling:
     def test_safe_run_with_single_string(self):
         """Test safe_run handles single string argument."""
         tool = MockTool()
-        # Mock the behavior for single string input
-        result = tool.safe_run(input="single string")
-        assert "result" in result
+        # A lone positional string is mapped to the tool's input parameter
+        result = tool.safe_run("single string")
+        assert result == {"result": "Processed: single string"}
     
     def test_safe_run_with_kwargs(self):
         """Test safe_run with keyword arguments."""
         tool = MockTool()
         result = tool.safe_run(input="kwarg test", extra="ignored")
-        assert "result" in result
+        assert result == {"result": "Processed: kwarg test"}
     
     def test_default_parameters_schema(self):
         """Test default parameters schema generation."""
-        class MinimalTool(BaseTool):
-            def __init__(self):
-                super().__init__(name="minimal", description="Minimal tool")
-            
-            def _run(self, **kwargs):
-                return {}
-        
         tool = MinimalTool()
         assert tool.parameters["type"] == "object"
         assert tool.parameters["properties"] == {}
@@ -165,5 +184,109 @@ class TestToolLogging:
         assert tool.logger is not None
 
 
+class TestAsyncCaller:
+    """Tests for bounded, retrying tool calls."""
+
+    def test_retries_transient_errors(self):
+        """Test rate-limited calls are retried until they succeed."""
+        import asyncio
+        from app.tool.async_caller import AsyncCaller
+
+        calls = []
+
+        def flaky():
+            calls.append(1)
+            if len(calls) < 3:
+                raise ConnectionError("connection reset")
+            return "ok"
+
+        caller = AsyncCaller(max_concurrency=2, max_retries=3)
+        with patch("app.tool.async_caller.asyncio.sleep", new=AsyncMock()) as sleep:
+            result = asyncio.run(caller.call(flaky))
+
+        assert result == "ok"
+        assert len(calls) == 3
+        assert [c.args[0] for c in sleep.call_args_list] == [1, 2]
+
+    def test_does_not_retry_other_errors(self):
+        """Test non-transient errors propagate immediately."""
+        import asyncio
+        from app.tool.async_caller import AsyncCaller
+
+        func = Mock(side_effect=ValueError("bad input"))
+        caller = AsyncCaller(max_retries=3)
+
+        with pytest.raises(ValueError):
+            asyncio.run(caller.call(func))
+        assert func.call_count == 1
+
+    def test_does_not_retry_wrapped_file_errors(self):
+        """Test a missing file surfaced as a ToolError is not retried."""
+        import asyncio
+        from app.exceptions import ToolError
+        from app.tool.async_caller import AsyncCaller
+
+        class MissingFileTool(BaseTool):
+            def __init__(self):
+                super().__init__(name="missing_file", description="Opens a missing file")
+                self.calls = 0
+
+            def _run(self, **kwargs):
+                self.calls += 1
+                open("/nonexistent/open-agent/input.txt")
+
+        tool = MissingFileTool()
+        caller = AsyncCaller(max_retries=6)
+
+        with patch("app.tool.async_caller.asyncio.sleep", new=AsyncMock()) as sleep:
+            with pytest.raises(ToolError):
+                asyncio.run(caller.call(tool.run))
+        assert tool.calls == 1
+        sleep.assert_not_called()
+
+    def test_transient_errors_classified(self):
+        """Test only connection failures, timeouts and HTTP 429/503 count as transient."""
+        from app.tool.async_caller import is_transient_error
+
+        class StatusError(Exception):
+            def __init__(self, status_code):
+                super().__init__(f"HTTP {status_code}")
+                self.status_code = status_code
+
+        assert is_transient_error(ConnectionResetError("connection reset"))
+        assert is_transient_error(TimeoutError("timed out"))
+        assert is_transient_error(StatusError(429))
+        assert is_transient_error(StatusError(503))
+        assert not is_transient_error(StatusError(404))
+        assert not is_transient_error(ValueError("row 503 missing"))
+        assert not is_transient_error(PermissionError("denied"))
+
+    def test_bounds_concurrency(self):
+        """Test no more than max_concurrency calls run at once."""
+        import asyncio
+        import threading
+        import time
+        from app.tool.async_caller import AsyncCaller
+
+        lock = threading.Lock()
+        state = {"running": 0, "peak": 0}
+
+        def work():
+            with lock:
+                state["running"] += 1
+                state["peak"] = max(state["peak"], state["running"])
+            time.sleep(0.02)
+            with lock:
+                state["running"] -= 1
+
+        caller = AsyncCaller(max_concurrency=2)
+
+        async def main():
+            await asyncio.gather(*(caller.wrap(work)() for _ in range(6)))
+
+        asyncio.run(main())
+        assert state["peak"] <= 2
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])